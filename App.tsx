@@ -93,8 +93,9 @@ const App: React.FC = () => {
 
     try {
       const historyData = await apiService.getQuizHistory();
-      // Map backend data to QuizResult[]
-      const mappedHistory: QuizResult[] = historyData.map((item: any) => ({
+      // Map backend data to QuizResult[] (the first page of a paginated response)
+      const historyItems = Array.isArray(historyData) ? historyData : historyData.results;
+      const mappedHistory: QuizResult[] = historyItems.map((item: any) => ({
         id: item.id.toString(),
         topic: item.quiz_topic,
         difficulty: item.quiz_difficulty,
@@ -14,6 +14,12 @@ python manage.py collectstatic --no-input
 # Apply database migrations
 python manage.py migrate
 
+# Shared cache table used when REDIS_URL is not set
+python manage.py createcachetable
+
+# Compile the active theme stylesheet so whitenoise serves it from startup
+python manage.py compile_theme_css
+
 # Create default superuser (if it doesn't exist)
 echo "Creating default superuser..."
 python manage.py create_default_superuser
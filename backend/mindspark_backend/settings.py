@@ -3,6 +3,7 @@ Django settings for mindspark_backend project.
 """
 
 from pathlib import Path
+import json
 import os
 from dotenv import load_dotenv
 import dj_database_url
@@ -30,6 +31,7 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    'whitenoise.runserver_nostatic',  # let WhiteNoise (and the theme stylesheet fallback) handle /static/
     'django.contrib.staticfiles',
     'django.contrib.sites',
     'rest_framework',
@@ -45,7 +47,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'quiz.middleware.QuizWhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -115,6 +117,34 @@ else:
         }
     }
 
+# Cache
+# Version tokens for cached theme/homepage data must be shared by every worker, so the
+# fallback is a database table (created by ``manage.py createcachetable``).
+# Set REDIS_URL (requires the redis package) for a faster shared cache.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'KEY_PREFIX': 'mindspark',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'quiz_cache',
+            'KEY_PREFIX': 'mindspark',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
+# Seconds each process trusts a cache version token before re-reading it from the shared cache
+QUIZ_CACHE_VERSION_TTL = float(os.getenv('QUIZ_CACHE_VERSION_TTL', '5'))
+
+# Upper bound on how long a cached anonymous page (e.g. the landing page) survives a deploy
+PAGE_CACHE_TIMEOUT = int(os.getenv('PAGE_CACHE_TIMEOUT', '600'))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -195,11 +225,54 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # orjson-backed JSON (stdlib fallback when orjson is not installed)
+    'DEFAULT_RENDERER_CLASSES': [
+        'quiz.fast_json.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'quiz.fast_json.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 # Gemini API Key
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
 
+# LLM backend used for quiz generation: GeminiBackend, FakeBackend (offline load tests)
+# or ReplayBackend (recorded responses); OPTIONS is passed to the backend constructor
+QUIZ_LLM_BACKEND = {
+    'BACKEND': os.getenv('QUIZ_LLM_BACKEND', 'quiz.llm_backends.GeminiBackend'),
+    'OPTIONS': json.loads(os.getenv('QUIZ_LLM_BACKEND_OPTIONS', '{}')),
+}
+
+# Quiz generation jobs: 'thread' (in-process pool), 'sync' (inline) or 'db' (run_quiz_jobs command)
+QUIZ_JOB_MODE = os.getenv('QUIZ_JOB_MODE', 'thread')
+QUIZ_JOB_WORKERS = int(os.getenv('QUIZ_JOB_WORKERS', '4'))
+
+# Certificate PDF/PNG rendering pool (quiz.certificates); artifacts are stored under MEDIA_ROOT
+QUIZ_CERTIFICATE_WORKERS = int(os.getenv('QUIZ_CERTIFICATE_WORKERS', '2'))
+
+# Requests larger than the chunk size are split into concurrent chunks (0 disables chunking)
+QUIZ_GENERATION_CHUNK_SIZE = int(os.getenv('QUIZ_GENERATION_CHUNK_SIZE', '5'))
+QUIZ_GENERATION_MAX_PARALLEL = int(os.getenv('QUIZ_GENERATION_MAX_PARALLEL', '4'))
+QUIZ_GENERATION_CHUNK_RETRIES = 2
+# Stream single-call generations so the first question can be shown before the rest arrive
+QUIZ_GENERATION_STREAMING = os.getenv('QUIZ_GENERATION_STREAMING', 'True') == 'True'
+
+# Leaderboard sorted sets live in Redis when set (defaults to REDIS_URL); otherwise each
+# process keeps its own, re-synced from the database every SYNC_INTERVAL seconds
+QUIZ_LEADERBOARD_REDIS_URL = os.getenv('QUIZ_LEADERBOARD_REDIS_URL', os.getenv('REDIS_URL'))
+QUIZ_LEADERBOARD_SYNC_INTERVAL = float(os.getenv('QUIZ_LEADERBOARD_SYNC_INTERVAL', '5'))
+
+# Per-process pools of generated questions by topic (MAX_ENTRIES=0 disables it)
+QUIZ_GENERATION_CACHE = {
+    'MAX_ENTRIES': int(os.getenv('QUIZ_GENERATION_CACHE_ENTRIES', '256')),
+    'TTL': int(os.getenv('QUIZ_GENERATION_CACHE_TTL', str(6 * 60 * 60))),
+    'POOL_SIZE': int(os.getenv('QUIZ_GENERATION_CACHE_POOL_SIZE', '60')),
+}
+
 # Auth Settings
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'dashboard'
@@ -1,8 +1,12 @@
+import tempfile
+
 from django.contrib import admin
+from django.http import FileResponse
 from django.utils.html import format_html
 from django import forms
+from . import certificates
 from .models import (
-    Quiz, Question, QuizAttempt, UserAnswer, UserProfile, SiteTheme,
+    Quiz, Question, BankQuestion, QuizAttempt, UserAnswer, UserProfile, SiteTheme, QuizGenerationJob,
     StatCard, Feature, Testimonial, FooterSection, FooterLink, 
     HeroSection, SectionHeading
 )
@@ -90,8 +94,9 @@ class QuizAdmin(admin.ModelAdmin):
     inlines = [QuestionInline]
     
     def total_questions(self, obj):
-        return obj.questions.count()
+        return obj.question_count
     total_questions.short_description = 'Questions'
+    total_questions.admin_order_field = 'question_count'
 
 
 @admin.register(Question)
@@ -105,6 +110,18 @@ class QuestionAdmin(admin.ModelAdmin):
     question_text_short.short_description = 'Question'
 
 
+@admin.register(BankQuestion)
+class BankQuestionAdmin(admin.ModelAdmin):
+    list_display = ['topic', 'difficulty', 'language', 'question_text_short', 'times_served', 'created_at']
+    list_filter = ['difficulty', 'language', 'created_at']
+    search_fields = ['topic', 'question_text']
+    readonly_fields = ['content_hash', 'topic_key', 'times_served', 'created_at']
+
+    def question_text_short(self, obj):
+        return obj.question_text[:50] + '...' if len(obj.question_text) > 50 else obj.question_text
+    question_text_short.short_description = 'Question'
+
+
 class UserAnswerInline(admin.TabularInline):
     model = UserAnswer
     extra = 0
@@ -118,11 +135,29 @@ class QuizAttemptAdmin(admin.ModelAdmin):
     search_fields = ['user__username', 'quiz__topic']
     readonly_fields = ['completed_at']
     inlines = [UserAnswerInline]
+    actions = ['export_certificates_pdf', 'export_certificates_png']
     
     def score_display(self, obj):
         return f"{obj.score}/{obj.total_questions}"
     score_display.short_description = 'Score'
 
+    def export_certificates(self, queryset, fmt):
+        """Zip of the selected attempts' certificates, spooled to disk when large"""
+        archive = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+        certificates.export_zip(queryset.select_related('user', 'quiz'), [fmt], archive)
+        archive.seek(0)
+        return FileResponse(archive, as_attachment=True, filename=f'certificates-{fmt}.zip')
+
+    def export_certificates_pdf(self, request, queryset):
+        """Admin action to download the selected certificates as PDFs"""
+        return self.export_certificates(queryset, 'pdf')
+    export_certificates_pdf.short_description = "Download certificates (PDF, zip)"
+
+    def export_certificates_png(self, request, queryset):
+        """Admin action to download the selected certificates as PNGs"""
+        return self.export_certificates(queryset, 'png')
+    export_certificates_png.short_description = "Download certificates (PNG, zip)"
+
 
 @admin.register(UserAnswer)
 class UserAnswerAdmin(admin.ModelAdmin):
@@ -139,6 +174,14 @@ class UserAnswerAdmin(admin.ModelAdmin):
     question_short.short_description = 'Question'
 
 
+@admin.register(QuizGenerationJob)
+class QuizGenerationJobAdmin(admin.ModelAdmin):
+    list_display = ['topic', 'user', 'difficulty', 'count', 'language', 'status', 'created_at', 'finished_at']
+    list_filter = ['status', 'difficulty', 'language', 'created_at']
+    search_fields = ['topic', 'user__username']
+    readonly_fields = ['quiz', 'error', 'created_at', 'started_at', 'finished_at']
+
+
 @admin.register(SiteTheme)
 class SiteThemeAdmin(admin.ModelAdmin):
     """Admin interface for Site Theme management"""
@@ -0,0 +1,12 @@
+from rest_framework.routers import DefaultRouter
+
+from . import api_views
+
+router = DefaultRouter(trailing_slash=True)
+router.register('auth', api_views.AuthViewSet, basename='api-auth')
+router.register('quiz', api_views.QuizActionViewSet, basename='api-quiz')
+router.register('quizzes', api_views.QuizViewSet, basename='api-quizzes')
+router.register('attempts', api_views.AttemptViewSet, basename='api-attempts')
+router.register('admin', api_views.AdminViewSet, basename='api-admin')
+
+urlpatterns = router.urls
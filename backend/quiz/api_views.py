@@ -0,0 +1,280 @@
+"""
+REST API for the React client (services/apiService.ts)
+
+Every list endpoint is keyset-paginated. Quizzes and attempts are read
+through the values()-based row serializers (one query for the page and one
+per nested list), so the number of queries per request does not grow with the
+page size; ``?fields=a,b`` limits the top-level fields returned. The expected
+counts are checked by the check_api_queries management command.
+"""
+from dataclasses import asdict
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.db.models import Exists, OuterRef
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from rest_framework import permissions, status, viewsets
+from rest_framework.authtoken.models import Token
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+
+from . import conditional
+from . import grading
+from . import jobs
+from . import leaderboard
+from .generation_cache import get_cache as get_generation_cache
+from .models import Quiz, QuizAttempt, QuizGenerationJob, SiteStats, UserProfile
+from .serializers import (
+    AttemptRows, AttemptSummarySerializer, LoginSerializer, QuizAttemptSerializer, QuizCreateSerializer, QuizRows,
+    QuizSerializer, QuizSubmitSerializer, RegisterSerializer, UserProfileSerializer, UserUpdateSerializer
+)
+
+
+class IsQuizAdmin(permissions.BasePermission):
+    """Users whose profile carries the admin flag"""
+
+    def has_permission(self, request, view):
+        profile = getattr(request.user, 'profile', None)
+        return bool(profile and profile.is_admin)
+
+
+class QuizCursorPagination(CursorPagination):
+    ordering = ('-created_at', '-id')
+
+
+class AttemptCursorPagination(CursorPagination):
+    ordering = ('-completed_at', '-id')
+
+
+def requested_fields(request, rows_class):
+    """Top-level field names from ?fields=, or None for all of them"""
+    value = request.query_params.get('fields')
+    if not value:
+        return None
+    fields = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = fields - set(rows_class.field_names())
+    if unknown:
+        raise ValidationError({'fields': f"Unknown fields: {', '.join(sorted(unknown))}"})
+    return fields
+
+
+def serialize_one(rows_class, queryset):
+    rows = rows_class()
+    return rows.serialize(rows.values(queryset)[:1])[0]
+
+
+class RowsViewSetMixin:
+    """list and retrieve through a RowSerializer instead of serializer_class"""
+    rows_class = None
+    # Rows never change once written, so retrieve answers conditional requests from this column
+    last_modified_field = None
+
+    def list(self, request, *args, **kwargs):
+        rows = self.rows_class(fields=requested_fields(request, self.rows_class))
+        page = self.paginate_queryset(rows.values(self.get_queryset()))
+        return self.get_paginated_response(rows.serialize(page))
+
+    def get_final_queryset(self, queryset):
+        """The rows of ``queryset`` that will not change any more"""
+        return queryset
+
+    def retrieve(self, request, *args, **kwargs):
+        fields = requested_fields(request, self.rows_class)
+        rows = self.rows_class(fields=fields)
+        try:
+            queryset = self.get_queryset().filter(pk=int(kwargs['pk']))
+        except ValueError:
+            raise Http404
+
+        def build_response():
+            found = rows.serialize(rows.values(queryset)[:1])
+            if not found:
+                raise Http404
+            return Response(found[0])
+
+        final = self.last_modified_field and self.get_final_queryset(queryset).values_list(
+            'pk', self.last_modified_field
+        ).first()
+        if not final:
+            return build_response()
+        etag = conditional.make_etag(
+            self.basename, final[0], request.user.pk, request.user.username,
+            ','.join(sorted(fields or ())), request.accepted_media_type
+        )
+        return conditional.respond(request, etag, final[1], build_response, vary=('Accept', 'Authorization'))
+
+
+def user_payload(user):
+    profile = getattr(user, 'profile', None)
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'name': user.first_name or user.username,
+        'is_admin': bool(profile and profile.is_admin),
+        'avatar': profile.avatar.url if profile and profile.avatar else None,
+    }
+
+
+def auth_response(user, status_code=status.HTTP_200_OK):
+    token, _ = Token.objects.get_or_create(user=user)
+    return Response({'token': token.key, 'user': user_payload(user)}, status=status_code)
+
+
+class AuthViewSet(viewsets.ViewSet):
+    """/api/auth/: token registration, login, logout and the current user"""
+
+    def get_permissions(self):
+        if self.action in ('register', 'login'):
+            return [permissions.AllowAny()]
+        return super().get_permissions()
+
+    @action(detail=False, methods=['post'])
+    def register(self, request):
+        serializer = RegisterSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.save()
+        return auth_response(user, status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def login(self, request):
+        serializer = LoginSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        account = User.objects.filter(email__iexact=serializer.validated_data['email']).first()
+        user = account and authenticate(
+            request, username=account.username, password=serializer.validated_data['password']
+        )
+        if not user:
+            return Response({'error': 'Invalid email or password'}, status=status.HTTP_401_UNAUTHORIZED)
+        return auth_response(user)
+
+    @action(detail=False, methods=['post'])
+    def logout(self, request):
+        Token.objects.filter(user=request.user).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['get'])
+    def me(self, request):
+        return Response(user_payload(request.user))
+
+    @action(detail=False, methods=['patch'], url_path='update-profile')
+    def update_profile(self, request):
+        serializer = UserUpdateSerializer(request.user, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.save()
+        return Response({'user': user_payload(user)})
+
+
+class QuizActionViewSet(viewsets.ViewSet):
+    """/api/quiz/: queue quiz generation, poll its job and submit answers"""
+
+    @action(detail=False, methods=['post'])
+    def generate(self, request):
+        """Queue a generation job; the client polls its status URL for the quiz"""
+        serializer = QuizCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = QuizGenerationJob.objects.create(user=request.user, **serializer.validated_data)
+        jobs.enqueue(job)
+        status_url = reverse('api-quiz-job', args=[job.id], request=request)
+        return Response(
+            {'id': job.id, 'status': job.status, 'status_url': status_url},
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': status_url}
+        )
+
+    @action(detail=False, methods=['get'], url_path=r'jobs/(?P<job_id>[0-9]+)', url_name='job')
+    def job(self, request, job_id=None):
+        """Status of a generation job, with the quiz once it has completed"""
+        job = get_object_or_404(QuizGenerationJob, id=job_id, user=request.user)
+        data = {'id': job.id, 'status': job.status, 'error': job.error, 'quiz': None}
+        if job.status == QuizGenerationJob.STATUS_COMPLETED:
+            data['quiz'] = serialize_one(QuizRows, Quiz.objects.filter(pk=job.quiz_id))
+        return Response(data)
+
+    @action(detail=False, methods=['post'])
+    def submit(self, request):
+        serializer = QuizSubmitSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        quiz = get_object_or_404(Quiz, id=data['quiz_id'], user=request.user)
+        selections = {
+            answer['question_id']: answer.get('selected_option')
+            for answer in data['answers']
+            if 'question_id' in answer
+        }
+        attempt, created = grading.submit_attempt(
+            request.user, quiz, selections, submission_id=data.get('submission_id')
+        )
+        return Response(
+            serialize_one(AttemptRows, QuizAttempt.objects.filter(pk=attempt.pk)),
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+
+
+class QuizViewSet(RowsViewSetMixin, viewsets.ReadOnlyModelViewSet):
+    """/api/quizzes/: the requesting user's quizzes with their questions"""
+    serializer_class = QuizSerializer
+    rows_class = QuizRows
+    pagination_class = QuizCursorPagination
+    last_modified_field = 'created_at'
+
+    def get_queryset(self):
+        return Quiz.objects.filter(user=self.request.user)
+
+    def get_final_queryset(self, queryset):
+        # Questions are still being added while a generation job runs
+        return queryset.exclude(Exists(QuizGenerationJob.objects.filter(
+            quiz=OuterRef('pk'),
+            status__in=[QuizGenerationJob.STATUS_PENDING, QuizGenerationJob.STATUS_RUNNING]
+        )))
+
+    @action(detail=False, methods=['get'])
+    def my_quizzes(self, request):
+        return self.list(request)
+
+
+class AttemptViewSet(RowsViewSetMixin, viewsets.ReadOnlyModelViewSet):
+    """/api/attempts/: the requesting user's attempts with graded answers"""
+    serializer_class = QuizAttemptSerializer
+    rows_class = AttemptRows
+    pagination_class = AttemptCursorPagination
+    last_modified_field = 'completed_at'
+
+    def get_queryset(self):
+        return QuizAttempt.objects.filter(user=self.request.user)
+
+    @action(detail=False, methods=['get'])
+    def my_history(self, request):
+        return self.list(request)
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        profile, _ = UserProfile.objects.select_related('user').get_or_create(user=request.user)
+        standing = leaderboard.rank(leaderboard.GLOBAL, request.user)
+        return Response({
+            **UserProfileSerializer(profile).data,
+            'global_rank': standing.rank if standing else None,
+        })
+
+
+class AdminViewSet(viewsets.ViewSet):
+    """/api/admin/: site-wide statistics for admins"""
+    permission_classes = [permissions.IsAuthenticated, IsQuizAdmin]
+
+    @action(detail=False, methods=['get'])
+    def dashboard(self, request):
+        stats = SiteStats.get()
+        recent_attempts = QuizAttempt.objects.select_related('user', 'quiz').order_by('-completed_at')[:10]
+        return Response({
+            'total_users': stats.total_users,
+            'total_quizzes': stats.total_quizzes,
+            'total_attempts': stats.total_attempts,
+            'stats_refreshed_at': stats.refreshed_at,
+            'recent_attempts': AttemptSummarySerializer(recent_attempts, many=True).data,
+            'top_performers': [asdict(standing) for standing in leaderboard.top(leaderboard.GLOBAL, 10)],
+            'generation_cache': get_generation_cache().stats(),
+        })
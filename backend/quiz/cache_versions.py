@@ -0,0 +1,84 @@
+"""
+Version tokens for cached data derived from the database
+
+Cached values are stored under keys that include the current version token of
+their namespace. Writers replace the token after commit instead of deleting
+keys, so a reader that built a value from pre-change rows can only store it
+under the old version, where nobody looks any more.
+
+Tokens only reach every process through a shared cache (the database cache
+or Redis, see settings.CACHES). If QUIZ_CACHE_ALIAS names a per-process cache
+instead, tokens and values expire after LOCAL_TIMEOUT seconds so a change made
+in another process shows up within that time.
+
+Each process remembers a token it read for QUIZ_CACHE_VERSION_TTL seconds,
+so most requests do not touch the shared cache at all (with the database
+cache that lookup is a query). A bump is seen at once by the process that
+made it and by every other process within that interval.
+"""
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+LOCAL_TIMEOUT = 30
+
+_local_lock = threading.Lock()
+_local_tokens = {}  # (alias, namespace) -> (expires, token)
+
+
+def _alias() -> str:
+    return getattr(settings, 'QUIZ_CACHE_ALIAS', 'default')
+
+
+def get_cache():
+    return caches[_alias()]
+
+
+def timeout(cache=None):
+    """Timeout for tokens and versioned values: none in a shared cache"""
+    cache = cache or get_cache()
+    return LOCAL_TIMEOUT if isinstance(cache, LocMemCache) else None
+
+
+def _version_key(namespace: str) -> str:
+    return f'quiz:{namespace}:version'
+
+
+def _remember(namespace: str, version: str):
+    ttl = getattr(settings, 'QUIZ_CACHE_VERSION_TTL', 5)
+    with _local_lock:
+        _local_tokens[(_alias(), namespace)] = (time.monotonic() + ttl, version)
+
+
+def get_version(namespace: str, cache=None) -> str:
+    """Current token for a namespace, creating one on first use"""
+    entry = _local_tokens.get((_alias(), namespace))
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
+    cache = cache or get_cache()
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        # add() keeps a token another worker set in the meantime
+        if not cache.add(key, version, timeout=timeout(cache)):
+            version = cache.get(key, version)
+    _remember(namespace, version)
+    return version
+
+
+def versioned_key(namespace: str, name: str, version: str) -> str:
+    return f'quiz:{namespace}:{name}:{version}'
+
+
+def bump(namespace: str):
+    """Publish a new token, orphaning every value cached under the old one"""
+    cache = get_cache()
+    version = uuid.uuid4().hex
+    cache.set(_version_key(namespace), version, timeout=timeout(cache))
+    _remember(namespace, version)
@@ -0,0 +1,275 @@
+"""
+Rendered certificate artifacts
+
+A certificate is drawn once with Pillow and stored as a PNG and a PDF under
+``certificates/<attempt id>/<version>.<ext>`` in default storage. Everything
+about an attempt is immutable except what comes from outside it: the
+recipient's name and the theme colours. The version is a digest of those
+(and of the layout revision), so a rename or a new theme produces new files,
+older versions of the attempt are removed, and a versioned URL can be cached
+by the browser for a year.
+
+Rendering runs in a small thread pool (QUIZ_CERTIFICATE_WORKERS). Opening a
+certificate page schedules it, so downloads are usually ready when clicked;
+a request for a certificate that is still rendering waits for the same
+future instead of rendering it twice. With QUIZ_JOB_MODE 'sync' or 'db'
+certificates are rendered inline. ``export_zip`` bundles many certificates
+for admins (the QuizAttempt admin action and ``export_certificates``).
+"""
+import functools
+import hashlib
+import io
+import logging
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.dateformat import format as format_date
+from django.utils.text import slugify
+from PIL import Image, ImageDraw, ImageFont
+
+from . import theme_cache
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout changes so existing artifacts are re-rendered
+REVISION = 1
+FORMATS = {'pdf': 'application/pdf', 'png': 'image/png'}
+DIRECTORY = 'certificates'
+CACHE_CONTROL = 'private, max-age=31536000, immutable'
+
+# A4 landscape at 150 dpi
+DPI = 150
+WIDTH, HEIGHT = 1754, 1240
+GOLD = '#caa43d'
+MUTED = '#64748b'
+BODY = '#475569'
+RULE = '#e2e8f0'
+
+# TrueType files by role, looked up in the system font directories; override with
+# QUIZ_CERTIFICATE_FONTS (e.g. for scripts DejaVu does not cover)
+DEFAULT_FONTS = {
+    'title': 'DejaVuSerif-Bold.ttf',
+    'name': 'DejaVuSerif.ttf',
+    'text': 'DejaVuSans.ttf',
+    'strong': 'DejaVuSans-Bold.ttf',
+}
+
+
+@dataclass(frozen=True)
+class CertificateData:
+    """Everything drawn on a certificate, detached from the ORM for the worker threads"""
+    attempt_id: int
+    recipient: str
+    topic: str
+    difficulty: str
+    score_percentage: float
+    completed_at: datetime
+    ink_color: str
+    highlight_color: str
+
+    @property
+    def version(self) -> str:
+        parts = (REVISION, self.recipient, self.ink_color, self.highlight_color)
+        return hashlib.sha256('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()[:16]
+
+    def filename(self, fmt: str) -> str:
+        return f"certificate-{self.attempt_id}-{slugify(self.topic) or 'quiz'}.{fmt}"
+
+
+def certificate_data(attempt, theme=None) -> CertificateData:
+    """Build the drawing data of an attempt; select_related('user', 'quiz') avoids queries"""
+    theme = theme or theme_cache.get_active_theme()
+    return CertificateData(
+        attempt_id=attempt.id,
+        recipient=attempt.user.first_name or attempt.user.username,
+        topic=attempt.quiz.topic,
+        difficulty=attempt.quiz.difficulty,
+        score_percentage=attempt.score_percentage,
+        completed_at=attempt.completed_at,
+        ink_color=theme.navbar_background,
+        highlight_color=theme.primary_color,
+    )
+
+
+def artifact_name(attempt_id: int, version: str, fmt: str) -> str:
+    return f'{DIRECTORY}/{attempt_id}/{version}.{fmt}'
+
+
+@functools.lru_cache(maxsize=64)
+def _load_font(path: str, size: int):
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        logger.warning(f"Certificate font {path} not found, using Pillow's default font")
+        return ImageFont.load_default(size)
+
+
+def _font(role: str, size: int):
+    fonts = {**DEFAULT_FONTS, **getattr(settings, 'QUIZ_CERTIFICATE_FONTS', {})}
+    return _load_font(fonts[role], size)
+
+
+def _fitted_font(draw, text: str, role: str, size: int, max_width: int):
+    """The largest font of ``role`` up to ``size`` in which ``text`` fits ``max_width``"""
+    font = _font(role, size)
+    while size > 12 and draw.textlength(text, font=font) > max_width:
+        size -= 4
+        font = _font(role, size)
+    return font
+
+
+def render_image(data: CertificateData) -> Image.Image:
+    """Draw a certificate; the layout follows quiz/certificate.html"""
+    image = Image.new('RGB', (WIDTH, HEIGHT), 'white')
+    draw = ImageDraw.Draw(image)
+    center = WIDTH // 2
+    text_width = WIDTH - 520
+
+    draw.rectangle([0, 0, WIDTH - 1, HEIGHT - 1], outline=data.ink_color, width=40)
+    draw.rectangle([76, 76, WIDTH - 77, HEIGHT - 77], outline=GOLD, width=4)
+
+    seal_x, seal_y, radius = WIDTH - 220, 215, 80
+    draw.ellipse([seal_x - radius, seal_y - radius, seal_x + radius, seal_y + radius], outline=GOLD, width=5)
+    draw.multiline_text((seal_x, seal_y), 'MindSpark\nCertified', font=_font('strong', 18), fill=GOLD,
+                        anchor='mm', align='center', spacing=6)
+
+    draw.text((center, 250), 'Certificate of Completion', font=_font('title', 72), fill=data.ink_color, anchor='mm')
+    draw.text((center, 340), 'MINDSPARK AI QUIZ PLATFORM', font=_font('text', 30), fill=GOLD, anchor='mm')
+
+    draw.text((center, 470), 'This certificate is proudly presented to', font=_font('text', 32), fill=MUTED,
+              anchor='mm')
+    name_font = _fitted_font(draw, data.recipient, 'name', 104, text_width)
+    draw.text((center, 585), data.recipient, font=name_font, fill=data.ink_color, anchor='mm')
+    rule = min(draw.textlength(data.recipient, font=name_font), text_width) / 2 + 60
+    draw.line([center - rule, 665, center + rule, 665], fill=RULE, width=3)
+
+    draw.text((center, 740), 'For successfully completing the timer-based assessment on', font=_font('text', 32),
+              fill=BODY, anchor='mm')
+    draw.text((center, 805), data.topic, font=_fitted_font(draw, data.topic, 'strong', 44, text_width),
+              fill=data.ink_color, anchor='mm')
+    details = f'Difficulty: {data.difficulty}  •  Score: {data.score_percentage:g}%'
+    draw.text((center, 870), details, font=_font('strong', 32), fill=data.highlight_color, anchor='mm')
+
+    completed = format_date(timezone.localtime(data.completed_at), 'F d, Y')
+    for x, value, label in [(WIDTH * 0.28, completed, 'DATE COMPLETED'), (WIDTH * 0.72, 'MindSpark AI', 'VERIFIED BY')]:
+        draw.text((x, 1010), value, font=_font('name', 40), fill=data.ink_color, anchor='mb')
+        draw.line([x - 190, 1025, x + 190, 1025], fill=data.ink_color, width=2)
+        draw.text((x, 1045), label, font=_font('text', 22), fill=MUTED, anchor='mt')
+    return image
+
+
+def encode(image: Image.Image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == 'pdf':
+        image.save(buffer, 'PDF', resolution=DPI, quality=90)
+    else:
+        image.save(buffer, 'PNG', dpi=(DPI, DPI), optimize=True)
+    return buffer.getvalue()
+
+
+def render(data: CertificateData) -> dict:
+    """Write any missing artifacts of ``data``; returns their storage names by format"""
+    names = {fmt: artifact_name(data.attempt_id, data.version, fmt) for fmt in FORMATS}
+    missing = [fmt for fmt, name in names.items() if not default_storage.exists(name)]
+    if missing:
+        image = render_image(data)
+        for fmt in missing:
+            default_storage.save(names[fmt], ContentFile(encode(image, fmt)))
+        _remove_old_versions(data)
+    return names
+
+
+def _remove_old_versions(data: CertificateData):
+    directory = f'{DIRECTORY}/{data.attempt_id}'
+    try:
+        _, files = default_storage.listdir(directory)
+        for name in files:
+            if not name.startswith(f'{data.version}.'):
+                default_storage.delete(f'{directory}/{name}')
+    except (NotImplementedError, OSError) as e:
+        logger.warning(f"Could not clean up old certificates in {directory}: {str(e)}")
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_lock = threading.Lock()
+_in_flight = {}  # (attempt_id, version) -> Future
+
+
+def get_executor():
+    """Return the certificate worker pool, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'QUIZ_CERTIFICATE_WORKERS', 2),
+                    thread_name_prefix='quiz-certificate',
+                )
+    return _executor
+
+
+def _uses_pool() -> bool:
+    return getattr(settings, 'QUIZ_JOB_MODE', 'thread') == 'thread'
+
+
+def schedule(data: CertificateData):
+    """Future for the rendering of ``data``, shared with any already in flight"""
+    key = (data.attempt_id, data.version)
+    with _lock:
+        future = _in_flight.get(key)
+        if future is not None:
+            return future
+        future = _in_flight[key] = get_executor().submit(render, data)
+    # Outside the lock: the callback runs immediately when the future is already done
+    future.add_done_callback(lambda done: _forget(key, done))
+    return future
+
+
+def _forget(key, future):
+    with _lock:
+        if _in_flight.get(key) is future:
+            del _in_flight[key]
+
+
+def prefetch(data: CertificateData):
+    """Start rendering ``data`` in the background unless it exists already"""
+    if _uses_pool() and not default_storage.exists(artifact_name(data.attempt_id, data.version, 'pdf')):
+        schedule(data)
+
+
+def ensure(data: CertificateData) -> dict:
+    """Storage names of the artifacts of ``data``, rendering them first if needed"""
+    if not _uses_pool():
+        return render(data)
+    return schedule(data).result()
+
+
+def export_zip(attempts, formats, fileobj) -> int:
+    """
+    Write the certificates of ``attempts`` (with user and quiz selected) to a zip
+    archive in ``fileobj``. Missing ones are rendered in the pool. Returns the count.
+    """
+    theme = theme_cache.get_active_theme()
+    items = [certificate_data(attempt, theme) for attempt in attempts]
+    if _uses_pool():
+        futures = [schedule(data) for data in items]
+        names = [future.result() for future in futures]
+    else:
+        names = [render(data) for data in items]
+
+    # PNG and PDF data is already compressed
+    with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_STORED) as archive:
+        for data, paths in zip(items, names):
+            for fmt in formats:
+                with default_storage.open(paths[fmt], 'rb') as f:
+                    archive.writestr(data.filename(fmt), f.read())
+    return len(items)
+
@@ -0,0 +1,74 @@
+"""
+Conditional GET for pages and API responses built from immutable rows
+
+A quiz does not change once it is generated and an attempt does not change
+once it is submitted, so a response about one is identified by the row id
+and whatever else goes into it: for pages the theme version, the signed-in
+user's name and admin flag and the CSRF secret baked into forms; for the API
+the requested fields. Responses carry an ETag and Last-Modified, and a
+matching If-None-Match or If-Modified-Since is answered with 304 before the
+remaining queries run or a template is rendered. Browsers must revalidate
+on every use (``Cache-Control: private, no-cache``).
+"""
+import hashlib
+
+from django.contrib import messages
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from . import cache_versions
+from . import theme_cache
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the given parts"""
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+
+def page_parts(request) -> list:
+    """Everything besides the row that a page rendered for ``request`` depends on"""
+    user = request.user
+    profile = getattr(user, 'profile', None)
+    return [
+        cache_versions.get_version(theme_cache.NAMESPACE),
+        user.pk,
+        user.username,
+        user.first_name,
+        bool(profile and profile.is_admin),
+        request.META.get('CSRF_COOKIE', ''),
+    ]
+
+
+def respond(request, etag: str, last_modified, build_response, vary=('Cookie',)):
+    """
+    Return 304 when the client's copy is current, otherwise ``build_response()``.
+    Either way the response carries the validators.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = build_response()
+        if response.status_code != 200:
+            return response
+    response['ETag'] = etag
+    if timestamp:
+        response['Last-Modified'] = http_date(timestamp)
+    patch_vary_headers(response, vary)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_page(request, row_parts, last_modified, render_page):
+    """
+    ``respond`` for a page about the row identified by ``row_parts``. Last-Modified
+    is the later of ``last_modified`` and the active theme's last change.
+    """
+    if len(messages.get_messages(request)):
+        # The flashed messages are shown once, by this render
+        return render_page()
+    theme = theme_cache.get_active_theme(request)
+    theme_updated = getattr(theme, 'updated_at', None)
+    if theme_updated and last_modified and theme_updated > last_modified:
+        last_modified = theme_updated
+    return respond(request, make_etag(*row_parts, *page_parts(request)), last_modified, render_page)
@@ -1,14 +1,15 @@
-from .models import (
-    SiteTheme, StatCard, Feature, Testimonial, 
-    FooterSection, HeroSection, SectionHeading
-)
+from django.utils.functional import SimpleLazyObject
+
+from . import cache_versions
+from . import homepage_cache
+from . import theme_cache
 
 
 def theme_context(request):
     """
     Context processor to make the active theme available in all templates
     """
-    active_theme = SiteTheme.get_active_theme()
+    active_theme = theme_cache.get_active_theme(request)
     return {
         'active_theme': active_theme
     }
@@ -16,19 +17,19 @@ def theme_context(request):
 
 def homepage_content(request):
     """
-    Context processor to make homepage content available to all templates
+    Context processor to make homepage content available to all templates.
+    Values are lazy: the cached snapshot is only fetched when a template uses them.
     """
+    snapshot = homepage_cache.lazy_snapshot()
     return {
-        'hero_section': HeroSection.get_hero(),
-        'stats_cards': StatCard.objects.filter(is_active=True),
-        'features': Feature.objects.filter(is_active=True),
-        'testimonials': Testimonial.objects.filter(is_active=True),
-        'footer_section': FooterSection.get_footer(),
-        'section_headings': {
-            'features': SectionHeading.get_heading('features'),
-            'testimonials': SectionHeading.get_heading('testimonials'),
-            'how_it_works': SectionHeading.get_heading('how_it_works'),
-            'cta': SectionHeading.get_heading('cta'),
-        }
+        'homepage': snapshot,
+        'hero_section': SimpleLazyObject(lambda: snapshot.hero),
+        'stats_cards': SimpleLazyObject(lambda: snapshot.stats_cards),
+        'features': SimpleLazyObject(lambda: snapshot.features),
+        'testimonials': SimpleLazyObject(lambda: snapshot.testimonials),
+        'footer_section': SimpleLazyObject(lambda: snapshot.footer),
+        'footer_links': SimpleLazyObject(lambda: snapshot.footer_links),
+        'section_headings': SimpleLazyObject(lambda: snapshot.section_headings),
+        # Vary-on key for {% cache %} fragments built from homepage content
+        'homepage_version': SimpleLazyObject(lambda: cache_versions.get_version(homepage_cache.NAMESPACE)),
     }
-
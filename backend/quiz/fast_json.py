@@ -0,0 +1,61 @@
+"""
+Fast JSON encoding and decoding
+
+Uses orjson when it is installed and the stdlib ``json`` module otherwise,
+through quiz.json_codec. The DRF renderer and parser are registered in
+REST_FRAMEWORK settings; both produce and accept exactly what DRF's
+JSONRenderer/JSONParser do:
+
+    - datetimes, dates and times are formatted by DRF's encoder (ISO 8601,
+      milliseconds, ``Z`` for UTC), as are Decimals, UUIDs, lazy translation
+      strings and the other types it knows
+    - output is compact UTF-8 with U+2028/U+2029 escaped
+    - renderings with an indent (the browsable API) and non-UTF-8 request
+      bodies go through the stdlib classes
+"""
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import json_codec
+from .json_codec import DecodeError, loads, orjson  # noqa: F401
+
+_drf_encoder = JSONEncoder()
+
+# Datetimes are passed through to DRF's encoder so their format matches
+_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson is not None else 0
+
+
+def dumps(obj) -> bytes:
+    """Compact UTF-8 JSON, encoding non-native types like DRF does"""
+    return json_codec.dumps(obj, default=_drf_encoder.default, option=_OPTIONS, json_cls=JSONEncoder)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """JSONRenderer backed by orjson"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {})):
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = dumps(data)
+        # Like JSONRenderer: line and paragraph separators are valid JSON but not valid JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser backed by orjson"""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -1,39 +1,39 @@
 """
 Quiz generation service using Google Gemini AI
+
+Model calls go through the backend configured by QUIZ_LLM_BACKEND (see
+quiz.llm_backends), so the same code path runs against Gemini, the offline
+fake, or recorded responses.
 """
-import google.generativeai as genai
 from django.conf import settings
-import json
-import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
 
-# Configure Gemini API
-genai.configure(api_key=settings.GEMINI_API_KEY)
+from .llm_backends import get_backend
+from .llm_json import JSONArrayStreamParser, extract_objects
+from .question_bank import question_hash
 
+logger = logging.getLogger(__name__)
 
-def generate_quiz_questions(topic: str, difficulty: str, count: int, language: str = 'en') -> list:
+
+def build_prompt(topic: str, difficulty: str, count: int, language: str = 'en', part: tuple = None) -> str:
     """
-    Generate quiz questions using Gemini AI
-    
-    Args:
-        topic: The topic for the quiz
-        difficulty: Easy, Medium, or Hard
-        count: Number of questions to generate (1-100)
-        language: 'en' for English or 'hi' for Hindi
-    
-    Returns:
-        List of question dictionaries with format:
-        {
-            'question': str,
-            'options': [str, str, str, str],
-            'correct_index': int (0-3),
-            'explanation': str
-        }
+    Build the generation prompt.
+
+    ``part`` is an optional (index, total) pair used by chunked generation to
+    steer each chunk towards a different area of the topic.
     """
-    
+    part_hint = ''
+    if part:
+        part_hint = (
+            f"\nThis is batch {part[0]} of {part[1]} for the same quiz. "
+            f"Cover different sub-topics than the other batches so questions do not repeat.\n"
+        )
+
     # Language-specific prompts
     if language == 'hi':
-        prompt = f"""Create {count} multiple choice questions about "{topic}" for {difficulty} difficulty level in Hindi language.
-
+        return f"""Create {count} multiple choice questions about "{topic}" for {difficulty} difficulty level in Hindi language.
+{part_hint}
 For each question, provide:
 1. Question text in Hindi
 2. Four options (A, B, C, D) in Hindi
@@ -51,9 +51,9 @@ Format your response as a JSON array like this:
 ]
 
 Generate exactly {count} questions."""
-    else:
-        prompt = f"""Create {count} multiple choice questions about "{topic}" for {difficulty} difficulty level.
 
+    return f"""Create {count} multiple choice questions about "{topic}" for {difficulty} difficulty level.
+{part_hint}
 For each question, provide:
 1. Question text
 2. Four options (A, B, C, D)
@@ -72,41 +72,176 @@ Format your response as a JSON array like this:
 
 Generate exactly {count} questions. Make sure the JSON is valid and properly formatted."""
 
+
+def parse_questions(response_text: str) -> list:
+    """
+    Extract every complete question object from a model response, salvaging
+    what it can from code fences, trailing commas and truncated output
+    """
+    questions = extract_objects(response_text)
+    if not questions:
+        raise ValueError("Failed to parse AI response as JSON: no question objects found")
+    return questions
+
+
+def is_valid_question(q) -> bool:
+    """Check that a parsed item has the shape the quiz models expect"""
+    return (
+        isinstance(q, dict)
+        and all(key in q for key in ['question', 'options', 'correct_index', 'explanation'])
+        and isinstance(q['options'], list)
+        and len(q['options']) == 4
+        and isinstance(q['correct_index'], int)
+        and 0 <= q['correct_index'] <= 3
+    )
+
+
+def _generate_batch(topic: str, difficulty: str, count: int, language: str = 'en', part: tuple = None) -> list:
+    """Run one model call and return the valid questions it produced (possibly fewer than count)"""
+    response_text = get_backend().generate(build_prompt(topic, difficulty, count, language, part))
+    questions = parse_questions(response_text)
+    return [q for q in questions if is_valid_question(q)][:count]
+
+
+def generate_quiz_questions(topic: str, difficulty: str, count: int, language: str = 'en') -> list:
+    """
+    Generate quiz questions using Gemini AI
+
+    Args:
+        topic: The topic for the quiz
+        difficulty: Easy, Medium, or Hard
+        count: Number of questions to generate (1-100)
+        language: 'en' for English or 'hi' for Hindi
+
+    Returns:
+        List of question dictionaries with format:
+        {
+            'question': str,
+            'options': [str, str, str, str],
+            'correct_index': int (0-3),
+            'explanation': str
+        }
+    """
+    chunk_size = getattr(settings, 'QUIZ_GENERATION_CHUNK_SIZE', 5)
+    if chunk_size and count > chunk_size:
+        return generate_quiz_questions_chunked(topic, difficulty, count, language, chunk_size=chunk_size)
+
     try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        response = model.generate_content(prompt)
-        
-        # Extract JSON from response
-        response_text = response.text.strip()
-        
-        # Try to find JSON array in the response
-        json_match = re.search(r'\[\s*\{.*\}\s*\]', response_text, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0)
-        else:
-            # Try to clean up the response
-            json_str = response_text
-            if not json_str.startswith('['):
-                json_str = '[' + json_str
-            if not json_str.endswith(']'):
-                json_str = json_str + ']'
-        
-        # Parse JSON
-        questions = json.loads(json_str)
-        
-        # Validate questions
-        validated_questions = []
-        for q in questions[:count]:  # Ensure we don't exceed requested count
-            if all(key in q for key in ['question', 'options', 'correct_index', 'explanation']):
-                if len(q['options']) == 4 and 0 <= q['correct_index'] <= 3:
-                    validated_questions.append(q)
-        
+        validated_questions = _generate_batch(topic, difficulty, count, language)
+
         if len(validated_questions) < count:
             raise ValueError(f"Only generated {len(validated_questions)} valid questions out of {count}")
-        
+
         return validated_questions[:count]
-        
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Failed to parse AI response as JSON: {str(e)}")
+
+    except Exception as e:
+        raise ValueError(f"Error generating quiz: {str(e)}")
+
+
+def generate_quiz_questions_chunked(topic: str, difficulty: str, count: int, language: str = 'en',
+                                    chunk_size: int = 5, max_workers: int = None, retries: int = None) -> list:
+    """
+    Generate a large quiz as concurrent fixed-size chunks.
+
+    Chunks are requested in parallel from a bounded thread pool, merged and
+    deduplicated by question hash. Chunks that come back short (or fail) are
+    regenerated for the missing questions only, up to ``retries`` more rounds,
+    so total latency is bounded by the slowest chunk rather than the sum.
+    """
+    questions = []
+    for batch in iter_question_batches_chunked(topic, difficulty, count, language,
+                                               chunk_size, max_workers, retries):
+        questions.extend(batch)
+    return questions
+
+
+def iter_question_batches_chunked(topic: str, difficulty: str, count: int, language: str = 'en',
+                                  chunk_size: int = 5, max_workers: int = None, retries: int = None):
+    """Chunked generation that yields each chunk's new questions as soon as it completes"""
+    if max_workers is None:
+        max_workers = getattr(settings, 'QUIZ_GENERATION_MAX_PARALLEL', 4)
+    if retries is None:
+        retries = getattr(settings, 'QUIZ_GENERATION_CHUNK_RETRIES', 2)
+
+    produced = 0
+    seen = set()
+    total_chunks = -(-count // chunk_size)
+    pending = [min(chunk_size, count - start) for start in range(0, count, chunk_size)]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total_chunks))) as executor:
+        for attempt in range(retries + 1):
+            futures = [
+                executor.submit(_generate_batch, topic, difficulty, size, language, (index + 1, total_chunks))
+                for index, size in enumerate(pending)
+            ]
+            for future in as_completed(futures):
+                try:
+                    chunk = future.result()
+                except Exception as e:
+                    logger.warning(f"Quiz chunk failed for '{topic}' (round {attempt + 1}): {str(e)}")
+                    continue
+                batch = []
+                for q in chunk:
+                    key = question_hash(q)
+                    if key not in seen and produced + len(batch) < count:
+                        seen.add(key)
+                        batch.append(q)
+                if batch:
+                    produced += len(batch)
+                    yield batch
+
+            missing = count - produced
+            if missing <= 0:
+                return
+            pending = [min(chunk_size, missing - start) for start in range(0, missing, chunk_size)]
+
+    raise ValueError(f"Only generated {produced} valid questions out of {count}")
+
+
+def _iter_streamed_objects(chunks):
+    """Yield each JSON object from streamed response text as soon as it is complete"""
+    parser = JSONArrayStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def stream_quiz_questions(topic: str, difficulty: str, count: int, language: str = 'en'):
+    """
+    Generate questions from the backend's streaming response, yielding each valid
+    question as soon as its JSON object is complete.
+
+    Raises ValueError after the stream ends if fewer than ``count`` valid
+    questions were produced.
+    """
+    try:
+        response = get_backend().stream(build_prompt(topic, difficulty, count, language))
+        produced = 0
+        for q in _iter_streamed_objects(response):
+            if is_valid_question(q):
+                produced += 1
+                yield q
+                if produced >= count:
+                    return
+    except ValueError:
+        raise
     except Exception as e:
         raise ValueError(f"Error generating quiz: {str(e)}")
+
+    raise ValueError(f"Only generated {produced} valid questions out of {count}")
+
+
+def iter_question_batches(topic: str, difficulty: str, count: int, language: str = 'en'):
+    """
+    Progressive generation: yields lists of validated questions as they become
+    available. Large requests are chunked and run concurrently; smaller ones
+    use a single streamed call (QUIZ_GENERATION_STREAMING) or a single batch.
+    """
+    chunk_size = getattr(settings, 'QUIZ_GENERATION_CHUNK_SIZE', 5)
+    if chunk_size and count > chunk_size:
+        yield from iter_question_batches_chunked(topic, difficulty, count, language, chunk_size=chunk_size)
+    elif getattr(settings, 'QUIZ_GENERATION_STREAMING', True):
+        for q in stream_quiz_questions(topic, difficulty, count, language):
+            yield [q]
+    else:
+        yield generate_quiz_questions(topic, difficulty, count, language)
@@ -0,0 +1,153 @@
+"""
+In-process cache of generated question sets
+
+LLM output is pooled under a fingerprint of the normalized
+(topic, difficulty, language) of the request, so that popular requests such
+as "Python / Easy / 5 / en" are answered without another LLM call. The count
+is left out of the key on purpose: a pool serves any quiz up to its size, and
+each generation for the same topic adds to it. Only LLM output is stored;
+questions sampled from the bank for one user are not (see
+services.iter_quiz_question_batches). Entries expire after a TTL and the least
+recently used entry is evicted once the cache is full.
+
+Configured through the QUIZ_GENERATION_CACHE setting:
+
+    QUIZ_GENERATION_CACHE = {
+        'MAX_ENTRIES': 256,   # 0 disables the cache
+        'TTL': 6 * 60 * 60,   # seconds
+        'POOL_SIZE': 60,      # questions kept per entry
+    }
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+def normalize_topic(topic: str) -> str:
+    """Case-fold and collapse whitespace so equivalent topics share a key"""
+    return ' '.join((topic or '').split()).casefold()
+
+
+def make_key(topic: str, difficulty: str, language: str = 'en') -> str:
+    """Content-addressed fingerprint of a generation request"""
+    raw = '|'.join([
+        normalize_topic(topic),
+        (difficulty or '').strip().casefold(),
+        (language or 'en').strip().casefold(),
+    ])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _copy_questions(questions):
+    """Detach stored question dicts from callers that may mutate them"""
+    return [dict(q, options=list(q['options'])) for q in questions]
+
+
+def _identity(question: dict):
+    return question.get('bank_question_id') or question['question']
+
+
+class GenerationCache:
+    """Thread-safe LRU cache with per-entry TTL and hit/miss counters"""
+
+    def __init__(self, max_entries=256, ttl=6 * 60 * 60, pool_size=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.pool_size = pool_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Return a copy of the cached question list, or None. Lookups are not
+        counted: the caller decides whether the entry is usable and reports
+        the outcome with ``record``.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            questions = entry[1]
+        return _copy_questions(questions)
+
+    def record(self, hit: bool):
+        """Count a lookup as a hit (cached questions went into a quiz) or a miss"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def set(self, key, questions):
+        if self.max_entries <= 0:
+            return
+        stored = _copy_questions(questions)
+        with self._lock:
+            self._store(key, stored)
+
+    def extend(self, key, questions):
+        """
+        Add ``questions`` to the pool at ``key``, replacing older copies of the
+        same question and keeping the newest ``pool_size``; restarts the TTL
+        """
+        if self.max_entries <= 0:
+            return
+        added = _copy_questions(questions)
+        identities = {_identity(q) for q in added}
+        with self._lock:
+            entry = self._entries.get(key)
+            kept = [q for q in entry[1] if _identity(q) not in identities] if entry else []
+            self._store(key, (kept + added)[-self.pool_size:])
+
+    def _store(self, key, stored):
+        self._entries[key] = (time.monotonic() + self.ttl, stored)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits * 100 / lookups) if lookups else 0,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide generation cache configured from settings"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = getattr(settings, 'QUIZ_GENERATION_CACHE', {})
+                _cache = GenerationCache(
+                    max_entries=config.get('MAX_ENTRIES', 256),
+                    ttl=config.get('TTL', 6 * 60 * 60),
+                    pool_size=config.get('POOL_SIZE', 60),
+                )
+    return _cache
@@ -0,0 +1,124 @@
+"""
+Quiz grading engine
+
+A submission is graded in memory against the quiz's answer key, which is
+loaded with a single query. The attempt is inserted with its final score and
+all answers are written with one batched INSERT; the profile's running
+statistics and the leaderboards are updated in the same transaction.
+
+Each rendered quiz form carries a ``submission_id``; it is unique on
+QuizAttempt, so a double-submitted form (double click, retry after a timeout,
+two tabs racing) resolves to the attempt created by the first request.
+"""
+import uuid
+
+from django.db import IntegrityError, transaction
+
+from . import leaderboard
+from .models import QuizAttempt, UserAnswer, UserProfile
+
+UNANSWERED = -1
+OPTION_COUNT = 4
+
+
+def parse_selection(value) -> int:
+    """Selected option index from form data; anything invalid counts as unanswered"""
+    try:
+        selected = int(value)
+    except (TypeError, ValueError):
+        return UNANSWERED
+    return selected if 0 <= selected < OPTION_COUNT else UNANSWERED
+
+
+def parse_selections(data) -> dict:
+    """{question_id: raw value} from ``question_<id>`` form fields"""
+    selections = {}
+    for key, value in data.items():
+        prefix, _, question_id = key.partition('_')
+        if prefix == 'question' and question_id.isdigit():
+            selections[int(question_id)] = value
+    return selections
+
+
+def parse_submission_id(value):
+    """UUID from form data, or None when it is missing or malformed"""
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def load_answer_key(quiz) -> list:
+    """(question_id, correct_option) pairs in question order"""
+    return list(quiz.questions.order_by('order').values_list('id', 'correct_option'))
+
+
+def grade(answer_key, selections) -> tuple:
+    """
+    Grade selections ({question_id: raw form value}) against an answer key.
+
+    Returns (correct_count, [(question_id, selected_option, is_correct), ...]).
+    """
+    graded = []
+    correct_count = 0
+    for question_id, correct_option in answer_key:
+        selected = parse_selection(selections.get(question_id))
+        is_correct = selected == correct_option
+        correct_count += is_correct
+        graded.append((question_id, selected, is_correct))
+    return correct_count, graded
+
+
+def score_percentage(correct_count: int, total_questions: int) -> int:
+    return int((correct_count / total_questions) * 100) if total_questions > 0 else 0
+
+
+def submit_attempt(user, quiz, selections, submission_id=None) -> tuple:
+    """
+    Grade and persist a quiz submission.
+
+    Returns (attempt, created). When ``submission_id`` was already used, the
+    existing attempt is returned and nothing is written.
+    """
+    if submission_id is not None:
+        existing = QuizAttempt.objects.filter(submission_id=submission_id, user=user).first()
+        if existing:
+            return existing, False
+
+    answer_key = load_answer_key(quiz)
+    correct_count, graded = grade(answer_key, selections)
+    total_questions = len(answer_key)
+
+    try:
+        with transaction.atomic():
+            attempt = QuizAttempt.objects.create(
+                user=user,
+                quiz=quiz,
+                score=correct_count,
+                total_questions=total_questions,
+                score_percentage=score_percentage(correct_count, total_questions),
+                submission_id=submission_id
+            )
+            UserAnswer.objects.bulk_create([
+                UserAnswer(
+                    attempt=attempt,
+                    question_id=question_id,
+                    selected_option=selected,
+                    is_correct=is_correct
+                )
+                for question_id, selected, is_correct in graded
+            ])
+            if not UserProfile.record_attempt(user.id, attempt.score_percentage):
+                profile, _ = UserProfile.objects.get_or_create(user=user)
+                profile.update_stats()
+            leaderboard.record_attempt(attempt, quiz)
+    except IntegrityError:
+        # A concurrent request with the same submission_id won the race
+        existing = None
+        if submission_id is not None:
+            existing = QuizAttempt.objects.filter(submission_id=submission_id, user=user).first()
+        if existing is None:
+            raise
+        return existing, False
+
+    return attempt, True
@@ -0,0 +1,79 @@
+"""
+Precomputed homepage content
+
+All admin-editable homepage content is loaded into one HomepageSnapshot,
+stored in the cache every worker shares (see settings.CACHES) under a version
+token, and rebuilt only after one of the homepage models changes (see
+quiz.signals). The snapshot is treated as
+read-only; templates receive it through lazy objects so pages that never use
+homepage content do not even fetch it from the cache.
+"""
+from dataclasses import dataclass
+
+from django.utils.functional import SimpleLazyObject
+
+from . import cache_versions
+from .models import (
+    StatCard, Feature, Testimonial,
+    FooterSection, FooterLink, HeroSection, SectionHeading
+)
+
+NAMESPACE = 'homepage'
+SECTIONS = ('features', 'testimonials', 'how_it_works', 'cta')
+
+# Models whose changes invalidate the snapshot
+SOURCE_MODELS = (StatCard, Feature, Testimonial, FooterSection, FooterLink, HeroSection, SectionHeading)
+
+
+@dataclass(frozen=True)
+class HomepageSnapshot:
+    """Everything the homepage renders, loaded in one pass"""
+    hero: HeroSection
+    footer: FooterSection
+    footer_links: dict  # column -> tuple of FooterLink
+    stats_cards: tuple
+    features: tuple
+    testimonials: tuple
+    section_headings: dict  # section -> SectionHeading
+
+
+def build_snapshot() -> HomepageSnapshot:
+    """Load the snapshot from the database, creating singleton rows if missing"""
+    footer_links = {}
+    for link in FooterLink.objects.filter(is_active=True):
+        footer_links.setdefault(link.column, []).append(link)
+
+    headings = {heading.section: heading for heading in SectionHeading.objects.filter(section__in=SECTIONS)}
+    for section in SECTIONS:
+        if section not in headings:
+            headings[section] = SectionHeading.get_heading(section)
+
+    return HomepageSnapshot(
+        hero=HeroSection.get_hero(),
+        footer=FooterSection.get_footer(),
+        footer_links={column: tuple(links) for column, links in footer_links.items()},
+        stats_cards=tuple(StatCard.objects.filter(is_active=True)),
+        features=tuple(Feature.objects.filter(is_active=True)),
+        testimonials=tuple(Testimonial.objects.filter(is_active=True)),
+        section_headings=headings,
+    )
+
+
+def get_snapshot() -> HomepageSnapshot:
+    """Cached snapshot for the current homepage version"""
+    cache = cache_versions.get_cache()
+    key = cache_versions.versioned_key(NAMESPACE, 'snapshot', cache_versions.get_version(NAMESPACE, cache))
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_snapshot()
+        cache.set(key, snapshot, timeout=cache_versions.timeout(cache))
+    return snapshot
+
+
+def lazy_snapshot() -> HomepageSnapshot:
+    """Snapshot proxy that is only fetched when first accessed"""
+    return SimpleLazyObject(get_snapshot)
+
+
+def invalidate():
+    cache_versions.bump(NAMESPACE)
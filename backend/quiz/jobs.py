@@ -0,0 +1,179 @@
+"""
+Background quiz generation jobs
+
+Generation requests are stored as QuizGenerationJob rows and executed off the
+request path. The execution mode is selected with the QUIZ_JOB_MODE setting:
+
+    'thread' - run jobs in an in-process thread pool (default)
+    'sync'   - run jobs inline, used by tests and local debugging
+    'db'     - leave jobs pending for the ``run_quiz_jobs`` management command
+
+No external broker is required in any mode; the database row is the queue.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.utils import timezone
+
+from . import question_bank
+from . import services
+from .models import Question, QuizGenerationJob
+
+logger = logging.getLogger(__name__)
+
+# Questions streamed after the first batch are inserted in groups of this size
+STREAM_INSERT_SIZE = 5
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the shared worker pool, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'QUIZ_JOB_WORKERS', 4),
+                    thread_name_prefix='quiz-job',
+                )
+    return _executor
+
+
+def enqueue(job):
+    """Schedule a pending job according to QUIZ_JOB_MODE"""
+    mode = getattr(settings, 'QUIZ_JOB_MODE', 'thread')
+    if mode == 'sync':
+        run_job(job.pk)
+    elif mode == 'thread':
+        # Wait for the job row to be committed before a worker looks for it
+        transaction.on_commit(lambda: get_executor().submit(_run_in_worker, job.pk))
+
+
+def _run_in_worker(job_id):
+    """Thread pool entry point; worker threads own their DB connections"""
+    close_old_connections()
+    try:
+        run_job(job_id)
+    except Exception:
+        logger.exception(f"Unhandled error in quiz job {job_id}")
+    finally:
+        connections.close_all()
+
+
+def run_job(job_id):
+    """
+    Execute a single job. The pending -> running transition is a conditional
+    UPDATE, so a job is never run twice when the pool and the management
+    command race for it.
+    """
+    claimed = QuizGenerationJob.objects.filter(
+        pk=job_id, status=QuizGenerationJob.STATUS_PENDING
+    ).update(status=QuizGenerationJob.STATUS_RUNNING, started_at=timezone.now())
+    if not claimed:
+        return None
+
+    job = QuizGenerationJob.objects.select_related('user', 'quiz').get(pk=job_id)
+
+    # A requeued job resumes the quiz it had already started instead of creating another
+    quiz = job.quiz
+    remaining = job.count - (quiz.question_count if quiz else 0)
+    saved = []
+    pending = []
+    try:
+        batches = []
+        if remaining > 0:
+            batches = services.iter_quiz_question_batches(
+                job.topic, job.difficulty, remaining, job.language, fresh=job.fresh, user=job.user
+            )
+        for batch in batches:
+            if not batch:
+                continue
+            if quiz is None:
+                # The quiz becomes visible together with its first questions, so
+                # the take page can open while the rest stream in
+                with transaction.atomic():
+                    quiz, questions = services.create_quiz(
+                        job.user, job.topic, job.difficulty, job.language, batch
+                    )
+                    job.quiz = quiz
+                    job.save(update_fields=['quiz'])
+                saved.extend(zip(questions, batch))
+                continue
+            pending.extend(batch)
+            if len(pending) >= STREAM_INSERT_SIZE:
+                saved.extend(_save_pending(quiz, pending))
+        if quiz is None:
+            raise ValueError("No questions were generated")
+        saved.extend(_save_pending(quiz, pending))
+        _link_bank_questions(saved)
+        job.status = QuizGenerationJob.STATUS_COMPLETED
+    except Exception as e:
+        logger.error(f"Error generating quiz for job {job.pk}: {str(e)}")
+        job.status = QuizGenerationJob.STATUS_FAILED
+        job.error = str(e)
+        if quiz is not None and pending:
+            # Keep the questions generated before the failure with the partial quiz
+            _save_pending(quiz, pending)
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=['quiz', 'status', 'error', 'finished_at'])
+    return job
+
+
+def _save_pending(quiz, pending):
+    """Insert the buffered question dicts after the quiz's last question; empties the buffer"""
+    if not pending:
+        return []
+    questions = services.add_questions(quiz, pending, first_order=quiz.question_count + 1)
+    saved = list(zip(questions, pending))
+    pending.clear()
+    return saved
+
+
+def _link_bank_questions(saved):
+    """
+    Freshly generated questions only receive their bank id after the whole
+    generation has finished; copy it onto the rows persisted while streaming.
+    """
+    unlinked = []
+    for question, q_data in saved:
+        if question.bank_question_id is None and q_data.get('bank_question_id'):
+            question.bank_question_id = q_data['bank_question_id']
+            unlinked.append(question)
+    if unlinked:
+        Question.objects.bulk_update(unlinked, ['bank_question'])
+
+    question_bank.mark_served(q_data.get('bank_question_id') for _, q_data in saved)
+
+
+def run_pending_jobs(limit=None):
+    """Run pending jobs oldest first; returns the number of jobs executed"""
+    pending = QuizGenerationJob.objects.filter(
+        status=QuizGenerationJob.STATUS_PENDING
+    ).order_by('created_at').values_list('pk', flat=True)
+    if limit:
+        pending = pending[:limit]
+
+    executed = 0
+    for job_id in list(pending):
+        if run_job(job_id) is not None:
+            executed += 1
+    return executed
+
+
+def requeue_stale_jobs(older_than=timedelta(minutes=10)):
+    """
+    Return jobs stuck in 'running' (e.g. after a worker restart) to the queue.
+    A job that had already saved part of its quiz keeps it and only generates
+    the missing questions when it runs again.
+    """
+    return QuizGenerationJob.objects.filter(
+        status=QuizGenerationJob.STATUS_RUNNING,
+        started_at__lt=timezone.now() - older_than,
+    ).update(status=QuizGenerationJob.STATUS_PENDING, started_at=None)
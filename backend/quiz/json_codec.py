@@ -0,0 +1,35 @@
+"""
+Plain JSON encoding and decoding
+
+orjson when it is installed and the stdlib ``json`` module otherwise. Has no
+Django or DRF imports, so modules like quiz.llm_json can use it without
+configured settings; the DRF renderer and parser live in quiz.fast_json.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    DecodeError = orjson.JSONDecodeError
+else:
+    DecodeError = json.JSONDecodeError
+
+
+def loads(data):
+    """Decode JSON from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, default=None, option=0, json_cls=None) -> bytes:
+    """
+    Compact UTF-8 JSON. ``default`` encodes non-native types; ``option`` is
+    passed to orjson and ``json_cls`` to the stdlib fallback.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(obj, cls=json_cls, default=default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
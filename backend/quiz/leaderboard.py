@@ -0,0 +1,369 @@
+"""
+Leaderboards
+
+Every board ranks users by their best score_percentage; on equal scores the
+user who reached it first ranks higher. Boards:
+
+    global
+    difficulty:<Easy|Medium|Hard>
+    language:<en|hi>
+    weekly:<ISO year>-W<ISO week>   attempts completed in that week
+
+LeaderboardEntry rows are the source of truth. A submission updates the rows
+of its four boards with two queries, and after commit pushes the new score to
+a sorted structure per board, which serves "top N" and "my rank":
+
+    - a Redis sorted set when QUIZ_LEADERBOARD_REDIS_URL is set
+      (requires the redis package and Redis >= 6.2 for ZADD GT); updates
+      and rank lookups are O(log n)
+    - otherwise an in-process sorted list, loaded from the database on first
+      use and re-synced with rows changed by other workers every
+      QUIZ_LEADERBOARD_SYNC_INTERVAL seconds. Rank lookups bisect in
+      O(log n); an update inserts into (and deletes from) a Python list,
+      which is O(n), though only a memmove: tens of microseconds per update
+      on a board of a million users (see bench_leaderboard)
+
+Both stores only ever raise a user's key, so pushes can arrive out of order
+and re-syncs can overlap. Deleted users are dropped from a board when a top N
+read finds them missing; rebuild() recomputes everything from the attempts
+(in-process lists of other workers only drop lowered scores on restart).
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import LeaderboardEntry, QuizAttempt
+
+GLOBAL = 'global'
+BATCH_SIZE = 1000
+# Re-syncs look back this far so rows from transactions that committed late are not missed
+SYNC_OVERLAP = timedelta(seconds=60)
+# Redis keeps a finished week around for a month after it was last written
+WEEKLY_TTL = 35 * 24 * 60 * 60
+# Reads of a top N that drop deleted users before returning what is left
+TOP_PASSES = 3
+
+# Sort keys pack the score and the time it was reached into one number that
+# a float represents exactly: higher score first, then earlier achievement
+# (to the millisecond)
+_TIME_SPAN = 10 ** 13
+
+
+def sort_key(score: int, achieved_at: datetime) -> int:
+    return score * _TIME_SPAN + (_TIME_SPAN - 1 - int(achieved_at.timestamp() * 1000))
+
+
+def score_from_key(key) -> int:
+    return int(key) // _TIME_SPAN
+
+
+def difficulty_board(difficulty: str) -> str:
+    return f'difficulty:{difficulty}'
+
+
+def language_board(language: str) -> str:
+    return f'language:{language}'
+
+
+def weekly_board(when: datetime = None) -> str:
+    year, week, _ = timezone.localtime(when or timezone.now()).isocalendar()
+    return f'weekly:{year}-W{week:02d}'
+
+
+def boards_for(difficulty: str, language: str, completed_at: datetime) -> list:
+    """Names of the boards an attempt counts towards"""
+    return [GLOBAL, difficulty_board(difficulty), language_board(language), weekly_board(completed_at)]
+
+
+@dataclass(frozen=True)
+class Standing:
+    rank: int
+    user_id: int
+    username: str
+    best_score: int
+
+
+class _LocalBoard:
+    """Sorted list of (-key, user_id) with a user -> key index"""
+
+    def __init__(self):
+        self.entries = []
+        self.keys = {}
+        self.watermark = None
+        self.synced = 0.0
+
+    def add(self, user_id, key):
+        current = self.keys.get(user_id)
+        if current is not None:
+            if current >= key:
+                return
+            del self.entries[bisect_left(self.entries, (-current, user_id))]
+        insort(self.entries, (-key, user_id))
+        self.keys[user_id] = key
+
+    def remove(self, user_id):
+        key = self.keys.pop(user_id, None)
+        if key is not None:
+            del self.entries[bisect_left(self.entries, (-key, user_id))]
+
+    def top(self, limit):
+        return [(user_id, -neg_key) for neg_key, user_id in self.entries[:limit]]
+
+    def rank(self, user_id):
+        key = self.keys.get(user_id)
+        if key is None:
+            return None
+        return bisect_left(self.entries, (-key, user_id)) + 1, key
+
+
+class LocalStore:
+    """Per-process sorted lists kept in step with LeaderboardEntry"""
+
+    def __init__(self, sync_interval=5.0):
+        self.sync_interval = sync_interval
+        self._boards = {}
+        self._lock = threading.Lock()
+
+    def _board(self, name):
+        with self._lock:
+            board = self._boards.get(name)
+            if board is None:
+                board = self._boards[name] = _LocalBoard()
+        now = time.monotonic()
+        if now - board.synced >= self.sync_interval:
+            rows = LeaderboardEntry.objects.filter(board=name)
+            if board.watermark is not None:
+                rows = rows.filter(updated_at__gte=board.watermark - SYNC_OVERLAP)
+            rows = list(rows.values_list('user_id', 'best_score', 'achieved_at', 'updated_at'))
+            with self._lock:
+                for user_id, score, achieved_at, updated_at in rows:
+                    board.add(user_id, sort_key(score, achieved_at))
+                    if board.watermark is None or updated_at > board.watermark:
+                        board.watermark = updated_at
+                board.synced = now
+        return board
+
+    def push(self, name, user_id, key):
+        with self._lock:
+            board = self._boards.get(name)
+            if board is not None:
+                board.add(user_id, key)
+
+    def remove(self, name, user_id):
+        with self._lock:
+            board = self._boards.get(name)
+            if board is not None:
+                board.remove(user_id)
+
+    def top(self, name, limit):
+        board = self._board(name)
+        with self._lock:
+            return board.top(limit)
+
+    def rank(self, name, user_id):
+        board = self._board(name)
+        with self._lock:
+            return board.rank(user_id)
+
+    def size(self, name):
+        return len(self._board(name).keys)
+
+    def reset(self):
+        with self._lock:
+            self._boards.clear()
+
+
+class RedisStore:
+    """One Redis sorted set per board, filled from LeaderboardEntry when missing"""
+
+    def __init__(self, url, prefix='mindspark:leaderboard'):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _key(self, name):
+        return f'{self.prefix}:{name}'
+
+    def _ready_key(self, name):
+        return f'{self.prefix}:{name}:ready'
+
+    def _ensure_loaded(self, name):
+        if self.client.exists(self._ready_key(name)):
+            return
+        key = self._key(name)
+        rows = LeaderboardEntry.objects.filter(board=name).values_list('user_id', 'best_score', 'achieved_at')
+        batch = {}
+        for user_id, score, achieved_at in rows.iterator(chunk_size=BATCH_SIZE):
+            batch[user_id] = sort_key(score, achieved_at)
+            if len(batch) >= BATCH_SIZE:
+                self.client.zadd(key, batch, gt=True)
+                batch = {}
+        if batch:
+            self.client.zadd(key, batch, gt=True)
+        pipe = self.client.pipeline()
+        pipe.set(self._ready_key(name), 1)
+        if name.startswith('weekly:'):
+            pipe.expire(key, WEEKLY_TTL)
+            pipe.expire(self._ready_key(name), WEEKLY_TTL)
+        pipe.execute()
+
+    def push(self, name, user_id, key):
+        pipe = self.client.pipeline()
+        pipe.zadd(self._key(name), {user_id: key}, gt=True)
+        if name.startswith('weekly:'):
+            pipe.expire(self._key(name), WEEKLY_TTL)
+        pipe.execute()
+
+    def remove(self, name, user_id):
+        self.client.zrem(self._key(name), user_id)
+
+    def top(self, name, limit):
+        self._ensure_loaded(name)
+        return [
+            (int(member), int(key))
+            for member, key in self.client.zrevrange(self._key(name), 0, limit - 1, withscores=True)
+        ]
+
+    def rank(self, name, user_id):
+        self._ensure_loaded(name)
+        pipe = self.client.pipeline()
+        pipe.zrevrank(self._key(name), user_id)
+        pipe.zscore(self._key(name), user_id)
+        position, key = pipe.execute()
+        if position is None:
+            return None
+        return position + 1, int(key)
+
+    def size(self, name):
+        self._ensure_loaded(name)
+        return self.client.zcard(self._key(name))
+
+    def reset(self):
+        for key in self.client.scan_iter(f'{self.prefix}:*'):
+            self.client.delete(key)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The process-wide store selected by QUIZ_LEADERBOARD_REDIS_URL"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                url = getattr(settings, 'QUIZ_LEADERBOARD_REDIS_URL', None)
+                if url:
+                    _store = RedisStore(url)
+                else:
+                    _store = LocalStore(getattr(settings, 'QUIZ_LEADERBOARD_SYNC_INTERVAL', 5.0))
+    return _store
+
+
+@receiver(setting_changed)
+def _reset_store(setting, **kwargs):
+    global _store
+    if setting in ('QUIZ_LEADERBOARD_REDIS_URL', 'QUIZ_LEADERBOARD_SYNC_INTERVAL'):
+        _store = None
+
+
+def record_attempt(attempt, quiz):
+    """
+    Fold a new attempt into its boards. Call inside the submission's
+    transaction; the sorted sets are updated once it commits.
+    """
+    boards = boards_for(quiz.difficulty, quiz.language, attempt.completed_at)
+    score = attempt.score_percentage
+    now = timezone.now()
+    LeaderboardEntry.objects.bulk_create([
+        LeaderboardEntry(board=name, user_id=attempt.user_id, best_score=score,
+                         achieved_at=attempt.completed_at, updated_at=now)
+        for name in boards
+    ], ignore_conflicts=True)
+    LeaderboardEntry.objects.filter(
+        user_id=attempt.user_id, board__in=boards, best_score__lt=score
+    ).update(best_score=score, achieved_at=attempt.completed_at, updated_at=now)
+
+    key = sort_key(score, attempt.completed_at)
+
+    def push():
+        store = get_store()
+        for name in boards:
+            store.push(name, attempt.user_id, key)
+
+    transaction.on_commit(push)
+
+
+def top(board: str, limit: int = 10) -> list:
+    """The best ``limit`` standings on a board"""
+    store = get_store()
+    for _ in range(TOP_PASSES):
+        ranked = store.top(board, limit)
+        usernames = dict(User.objects.filter(id__in=[user_id for user_id, _ in ranked]).values_list('id', 'username'))
+        deleted = [user_id for user_id, _ in ranked if user_id not in usernames]
+        if not deleted:
+            break
+        # Drop deleted users; the next pass fills the gap from the cleaned-up set
+        for user_id in deleted:
+            store.remove(board, user_id)
+    present = [(user_id, key) for user_id, key in ranked if user_id in usernames]
+    return [
+        Standing(position, user_id, usernames[user_id], score_from_key(key))
+        for position, (user_id, key) in enumerate(present, start=1)
+    ]
+
+
+def rank(board: str, user) -> Standing:
+    """A user's standing on a board, or None if they have no attempts counted there"""
+    found = get_store().rank(board, user.id)
+    if found is None:
+        return None
+    position, key = found
+    return Standing(position, user.id, user.username, score_from_key(key))
+
+
+def size(board: str) -> int:
+    return get_store().size(board)
+
+
+def fold_attempts(rows) -> dict:
+    """
+    Best (score, achieved_at) per (board, user_id) from
+    (user_id, score_percentage, completed_at, difficulty, language) rows
+    ordered by completed_at
+    """
+    best = {}
+    for user_id, score, completed_at, difficulty, language in rows:
+        for name in boards_for(difficulty, language, completed_at):
+            current = best.get((name, user_id))
+            if current is None or score > current[0]:
+                best[(name, user_id)] = (score, completed_at)
+    return best
+
+
+def rebuild() -> int:
+    """Recompute every board from the recorded attempts; returns the number of entries"""
+    rows = QuizAttempt.objects.order_by('completed_at', 'id').values_list(
+        'user_id', 'score_percentage', 'completed_at', 'quiz__difficulty', 'quiz__language'
+    )
+    best = fold_attempts(rows.iterator(chunk_size=BATCH_SIZE))
+    now = timezone.now()
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        LeaderboardEntry.objects.bulk_create([
+            LeaderboardEntry(board=name, user_id=user_id, best_score=score, achieved_at=achieved_at, updated_at=now)
+            for (name, user_id), (score, achieved_at) in best.items()
+        ], batch_size=BATCH_SIZE)
+    transaction.on_commit(get_store().reset)
+    return len(best)
@@ -0,0 +1,216 @@
+"""
+Pluggable LLM backends for quiz generation
+
+The backend is selected with the QUIZ_LLM_BACKEND setting, in the same shape
+as Django's CACHES entries:
+
+    QUIZ_LLM_BACKEND = {
+        'BACKEND': 'quiz.llm_backends.FakeBackend',
+        'OPTIONS': {'latency': 2.0, 'jitter': 0.5, 'error_rate': 0.05},
+    }
+
+Available backends:
+
+    GeminiBackend - Google Gemini (default)
+    FakeBackend   - deterministic offline generator with configurable latency,
+                    jitter and error rate, for load tests
+    ReplayBackend - serves responses recorded on disk, optionally recording
+                    misses through another backend
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from . import json_codec
+
+
+class LLMBackendError(Exception):
+    """Raised when a backend cannot produce a response"""
+
+
+class BaseLLMBackend:
+    """Interface every backend implements"""
+
+    def __init__(self, **options):
+        self.options = options
+
+    def generate(self, prompt: str) -> str:
+        """Return the full response text for a prompt"""
+        raise NotImplementedError
+
+    def stream(self, prompt: str):
+        """Yield response text chunks as they are produced"""
+        yield self.generate(prompt)
+
+
+class GeminiBackend(BaseLLMBackend):
+    """Google Gemini via google.generativeai"""
+
+    _configure_lock = threading.Lock()
+    _configured_key = None
+
+    def __init__(self, model='gemini-2.5-flash', api_key=None, **options):
+        super().__init__(**options)
+        self.model_name = model
+        self.api_key = api_key if api_key is not None else settings.GEMINI_API_KEY
+
+    def _model(self):
+        import google.generativeai as genai
+
+        with self._configure_lock:
+            if GeminiBackend._configured_key != self.api_key:
+                genai.configure(api_key=self.api_key)
+                GeminiBackend._configured_key = self.api_key
+        return genai.GenerativeModel(self.model_name)
+
+    def generate(self, prompt: str) -> str:
+        return self._model().generate_content(prompt).text
+
+    def stream(self, prompt: str):
+        for chunk in self._model().generate_content(prompt, stream=True):
+            yield chunk.text
+
+
+class FakeBackend(BaseLLMBackend):
+    """
+    Offline generator that answers quiz prompts with well-formed questions.
+
+    The response for a given prompt is always the same. Latency, jitter and
+    failures are drawn from a separately seeded generator, so a load-test run
+    is reproducible as a whole.
+    """
+
+    PROMPT_PATTERN = re.compile(r'Create (\d+) multiple choice questions about "(.*?)"', re.DOTALL)
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, seed=0, stream_chunk_size=120, **options):
+        super().__init__(**options)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stream_chunk_size = stream_chunk_size
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+    def _draw(self):
+        with self._random_lock:
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            failed = self._random.random() < self.error_rate
+        return delay, failed
+
+    def render(self, prompt: str) -> str:
+        """Deterministic response text for a prompt"""
+        match = self.PROMPT_PATTERN.search(prompt)
+        count, topic = (int(match.group(1)), match.group(2)) if match else (5, 'General Knowledge')
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        rng = random.Random(digest)
+        questions = []
+        for i in range(count):
+            token = f'{digest[:8]}-{i + 1}'
+            questions.append({
+                'question': f'[{token}] Which statement about {topic} is correct?',
+                'options': [f'{topic} fact {token}{letter}' for letter in 'ABCD'],
+                'correct_index': rng.randrange(4),
+                'explanation': f'Generated offline by FakeBackend for "{topic}".',
+            })
+        return '```json\n' + json.dumps(questions, indent=2, ensure_ascii=False) + '\n```'
+
+    def generate(self, prompt: str) -> str:
+        delay, failed = self._draw()
+        time.sleep(delay)
+        if failed:
+            raise LLMBackendError('FakeBackend simulated failure')
+        return self.render(prompt)
+
+    def stream(self, prompt: str):
+        delay, failed = self._draw()
+        text = self.render(prompt)
+        chunks = [text[i:i + self.stream_chunk_size] for i in range(0, len(text), self.stream_chunk_size)]
+        fail_at = len(chunks) // 2 if failed else None
+        for index, chunk in enumerate(chunks):
+            time.sleep(delay / len(chunks))
+            if index == fail_at:
+                raise LLMBackendError('FakeBackend simulated failure')
+            yield chunk
+
+
+class ReplayBackend(BaseLLMBackend):
+    """
+    Serve responses captured on disk, keyed by a hash of the prompt.
+
+    mode:
+        'replay' - only serve recordings; a miss raises LLMBackendError
+        'record' - always call the wrapped backend and overwrite the recording
+        'auto'   - serve recordings, recording misses through the wrapped backend
+    """
+
+    def __init__(self, directory=None, mode='replay', backend=None, stream_chunk_size=120, **options):
+        super().__init__(**options)
+        self.directory = Path(directory or Path(settings.BASE_DIR) / 'llm_recordings')
+        self.mode = mode
+        self.stream_chunk_size = stream_chunk_size
+        self.wrapped = load_backend(backend) if backend else None
+
+    def _path(self, prompt: str) -> Path:
+        return self.directory / f"{hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:32]}.json"
+
+    def _record(self, prompt: str) -> str:
+        if self.wrapped is None:
+            raise LLMBackendError("ReplayBackend needs a 'backend' option to record responses")
+        text = self.wrapped.generate(prompt)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path(prompt).write_text(
+            json.dumps({'prompt': prompt, 'response': text}, ensure_ascii=False, indent=2),
+            encoding='utf-8',
+        )
+        return text
+
+    def generate(self, prompt: str) -> str:
+        path = self._path(prompt)
+        if self.mode == 'record' or (self.mode == 'auto' and not path.exists()):
+            return self._record(prompt)
+        try:
+            return json_codec.loads(path.read_bytes())['response']
+        except FileNotFoundError:
+            raise LLMBackendError(f'No recorded response for prompt ({path.name})')
+
+    def stream(self, prompt: str):
+        text = self.generate(prompt)
+        for i in range(0, len(text), self.stream_chunk_size):
+            yield text[i:i + self.stream_chunk_size]
+
+
+def load_backend(config: dict) -> BaseLLMBackend:
+    """Instantiate a backend from a {'BACKEND': path, 'OPTIONS': {...}} dict"""
+    backend_class = import_string(config.get('BACKEND', 'quiz.llm_backends.GeminiBackend'))
+    return backend_class(**config.get('OPTIONS', {}))
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> BaseLLMBackend:
+    """Return the process-wide backend configured by QUIZ_LLM_BACKEND"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = load_backend(getattr(settings, 'QUIZ_LLM_BACKEND', {}))
+    return _backend
+
+
+@receiver(setting_changed)
+def _reset_backend(setting, **kwargs):
+    """Pick up override_settings(QUIZ_LLM_BACKEND=...) in tests"""
+    global _backend
+    if setting in ('QUIZ_LLM_BACKEND', 'GEMINI_API_KEY'):
+        _backend = None
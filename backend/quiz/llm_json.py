@@ -0,0 +1,220 @@
+"""
+Incremental extraction of JSON objects from LLM output
+
+The model is asked for a JSON array of question objects, but real responses
+arrive wrapped in prose or code fences, contain trailing commas, stray
+brackets, or are cut off mid-object. Instead of matching the whole response
+with a regex, the parser makes a single forward pass over the text, tracks the
+container nesting outside of string literals, and decodes each item object as
+soon as its closing brace arrives. Every complete object is salvaged even if
+the surrounding array is malformed; an unterminated final object is dropped.
+
+The same parser serves streamed responses (``feed`` chunks as they arrive)
+and complete responses (``extract_objects``). Objects that need the slow path
+are decoded with quiz.json_codec (orjson when installed); the fast path needs
+the end offset that only the stdlib's ``raw_decode`` reports.
+"""
+import json
+import re
+
+from .json_codec import loads
+
+# Characters that can change parser state; everything else is skipped in bulk
+_STRUCTURAL = re.compile(r'[\[\]{}"\\]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_CLOSERS = {']': '[', '}': '{'}
+_decoder = json.JSONDecoder()
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """Remove commas directly before a closing bracket, ignoring string contents"""
+    out = []
+    in_string = False
+    escape = False
+    pending_comma = None
+    for char in text:
+        if in_string:
+            out.append(char)
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+        if pending_comma is not None:
+            if char.isspace():
+                pending_comma.append(char)
+                continue
+            if char not in '}]':
+                out.extend(pending_comma)
+            else:
+                out.extend(pending_comma[1:])
+            pending_comma = None
+        if char == ',':
+            pending_comma = [char]
+            continue
+        if char == '"':
+            in_string = True
+        out.append(char)
+    if pending_comma is not None:
+        out.extend(pending_comma)
+    return ''.join(out)
+
+
+def _items(obj) -> list:
+    """``obj`` itself, or the objects a wrapper without question keys holds in its values"""
+    if not isinstance(obj, dict) or 'question' in obj or 'options' in obj:
+        return [obj]
+    found = []
+    for value in obj.values():
+        for candidate in (value if isinstance(value, list) else [value]):
+            if isinstance(candidate, dict):
+                found.extend(_items(candidate))
+    return found or [obj]
+
+
+def decode_object(text: str):
+    """Decode one JSON object, tolerating trailing commas; returns None if invalid"""
+    try:
+        return loads(text)
+    except ValueError:
+        pass
+    try:
+        return loads(_strip_trailing_commas(text))
+    except ValueError:
+        return None
+
+
+class JSONArrayStreamParser:
+    """
+    Feed text chunks in arrival order; ``feed`` returns every item object that
+    became complete with that chunk.
+
+    An item object is the outermost object of its nesting, whether it sits at
+    the top level or inside (possibly nested) arrays. A complete object that
+    is not a question but a wrapper, like ``{"questions": [...]}``, yields the
+    objects inside its values instead. Quotes are only treated
+    as string delimiters inside a container, so apostrophes and quotes in
+    surrounding prose cannot desynchronise the scan; closing brackets that do
+    not match the open container are ignored. Call ``close`` once the input is
+    complete to recover objects hidden behind an unterminated opening brace.
+    """
+
+    # Bound on re-scans in ``close`` so pathological input stays linear-ish
+    MAX_RESCANS = 8
+
+    def __init__(self):
+        self._buffer = ''
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._object_start = None
+        self._object_depth = 0
+        self.skipped = 0
+
+    def feed(self, chunk: str) -> list:
+        self._buffer += chunk
+        buffer = self._buffer
+        objects = []
+        pos = self._pos
+        stack = self._stack
+
+        while pos < len(buffer):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = _STRING_SPECIAL.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                pos = match.end()
+                if match.group() == '\\':
+                    self._escape = True
+                else:
+                    self._in_string = False
+                continue
+
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            char = match.group()
+            index = match.start()
+            pos = match.end()
+
+            if char == '"':
+                if stack:
+                    self._in_string = True
+            elif char in '[{':
+                if char == '{' and self._object_start is None:
+                    # Fast path: well-formed items are decoded at C speed in one step
+                    try:
+                        obj, end = _decoder.raw_decode(buffer, index)
+                    except ValueError:
+                        pass
+                    else:
+                        objects.extend(_items(obj))
+                        pos = end
+                        continue
+                    self._object_start = index
+                    self._object_depth = len(stack)
+                stack.append(char)
+            elif char in ']}':
+                if not stack or stack[-1] != _CLOSERS[char]:
+                    continue
+                stack.pop()
+                if char == '}' and self._object_start is not None and len(stack) == self._object_depth:
+                    obj = decode_object(buffer[self._object_start:pos])
+                    if obj is not None:
+                        objects.extend(_items(obj))
+                    else:
+                        # A brace in prose may have swallowed real items; look inside it
+                        self.skipped += 1
+                        objects.extend(extract_objects(buffer[self._object_start + 1:pos - 1]))
+                    self._object_start = None
+
+        # Discard text that can no longer be part of an item object
+        keep_from = self._object_start if self._object_start is not None else pos
+        self._buffer = buffer[keep_from:]
+        self._pos = pos - keep_from
+        if self._object_start is not None:
+            self._object_start = 0
+        return objects
+
+    @property
+    def has_partial_object(self) -> bool:
+        """True when the input so far ends inside an item object"""
+        return self._object_start is not None
+
+    def close(self) -> list:
+        """
+        Signal end of input. If the text ended inside an object, that object
+        was either truncated or opened by a stray brace in prose; re-scan what
+        follows its opening brace and return any complete objects found there.
+        """
+        objects = []
+        remainder = self._buffer if self.has_partial_object else ''
+        for _ in range(self.MAX_RESCANS):
+            if not remainder:
+                break
+            parser = JSONArrayStreamParser()
+            objects.extend(parser.feed(remainder[1:]))
+            self.skipped += parser.skipped
+            remainder = parser._buffer if parser.has_partial_object else ''
+        self._buffer = ''
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._object_start = None
+        return objects
+
+
+def extract_objects(text: str) -> list:
+    """Return every complete item object found in a full LLM response"""
+    parser = JSONArrayStreamParser()
+    return parser.feed(text) + parser.close()
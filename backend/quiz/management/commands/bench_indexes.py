@@ -0,0 +1,163 @@
+"""
+Django management command to benchmark the hot-path indexes.
+
+Creates a throwaway test database (like ``manage.py test``), seeds it with a
+large dataset, then runs the hot queries with the indexes from migration
+0010_hot_path_indexes dropped and again with them in place, printing the
+EXPLAIN plan and the mean time of each query. The configured database is
+never written to.
+"""
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from quiz.models import Quiz, Question, QuizAttempt, QuizGenerationJob, SiteTheme, UserProfile
+
+BENCH_INDEXES = [
+    (Quiz, 'quiz_quiz_user_recent_idx'),
+    (Question, 'quiz_question_order_idx'),
+    (QuizAttempt, 'quiz_attempt_user_history_idx'),
+    (QuizAttempt, 'quiz_attempt_recent_idx'),
+    (UserProfile, 'quiz_profile_best_score_idx'),
+    (QuizGenerationJob, 'quiz_job_queue_idx'),
+]
+BENCH_CONSTRAINTS = [
+    (SiteTheme, 'quiz_single_active_theme'),
+]
+
+
+def hot_queries(user, quiz):
+    """(label, queryset) pairs mirroring the views that use each index"""
+    return [
+        ('profile history', QuizAttempt.objects.filter(user=user).select_related('quiz')
+         .order_by('-completed_at', '-pk')[:21]),
+        ('admin recent attempts', QuizAttempt.objects.select_related('user', 'quiz').order_by('-completed_at')[:10]),
+        ('admin top performers', UserProfile.objects.select_related('user').order_by('-best_score')[:10]),
+        ('user quizzes', Quiz.objects.filter(user=user).order_by('-created_at')[:20]),
+        ('quiz questions', Question.objects.filter(quiz=quiz).order_by('order')),
+        ('pending jobs', QuizGenerationJob.objects.filter(status=QuizGenerationJob.STATUS_PENDING)
+         .order_by('created_at')[:10]),
+        ('active theme', SiteTheme.objects.filter(is_active=True)[:1]),
+    ]
+
+
+def _index(model, name):
+    for index in model._meta.indexes:
+        if index.name == name:
+            return index
+    raise LookupError(name)
+
+
+def _constraint(model, name):
+    for constraint in model._meta.constraints:
+        if constraint.name == name:
+            return constraint
+    raise LookupError(name)
+
+
+class Command(BaseCommand):
+    help = 'Seeds a throwaway database and compares hot query plans and timings with and without indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2000)
+        parser.add_argument('--attempts-per-user', type=int, default=25)
+        parser.add_argument('--themes', type=int, default=200)
+        parser.add_argument('--jobs', type=int, default=20000)
+        parser.add_argument('--repeat', type=int, default=50, help='Executions per query when timing')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            user, quiz = self.seed(options)
+            with connection.schema_editor() as editor:
+                for model, name in BENCH_INDEXES:
+                    editor.remove_index(model, _index(model, name))
+                for model, name in BENCH_CONSTRAINTS:
+                    editor.remove_constraint(model, _constraint(model, name))
+            self.analyze()
+            before = self.run_queries(user, quiz, options['repeat'], 'Without indexes')
+
+            with connection.schema_editor() as editor:
+                for model, name in BENCH_INDEXES:
+                    editor.add_index(model, _index(model, name))
+                for model, name in BENCH_CONSTRAINTS:
+                    editor.add_constraint(model, _constraint(model, name))
+            self.analyze()
+            after = self.run_queries(user, quiz, options['repeat'], 'With indexes')
+
+            self.stdout.write(self.style.SUCCESS('Summary (mean ms per query)'))
+            for label in before:
+                speedup = before[label] / after[label] if after[label] else float('inf')
+                self.stdout.write(f'  {label:<24} {before[label]:9.3f} -> {after[label]:9.3f}  ({speedup:.1f}x)')
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def seed(self, options):
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+        self.stdout.write(f"Seeding {options['users']} users x {options['attempts_per_user']} attempts...")
+
+        users = User.objects.bulk_create(
+            [User(username=f'bench{i}') for i in range(options['users'])], batch_size=1000
+        )
+        UserProfile.objects.bulk_create(
+            [UserProfile(user=u, best_score=rng.randint(0, 100)) for u in users],
+            batch_size=1000, ignore_conflicts=True
+        )
+        quizzes = Quiz.objects.bulk_create(
+            [Quiz(user=u, topic=f'Topic {i % 50}', difficulty='Medium',
+                  created_at=now - timedelta(minutes=rng.randint(0, 500000)))
+             for i, u in enumerate(users) for _ in range(2)],
+            batch_size=1000
+        )
+        Question.objects.bulk_create(
+            [Question(quiz=q, question_text='Q', option_a='a', option_b='b', option_c='c', option_d='d',
+                      correct_option=0, explanation='', order=order)
+             for q in quizzes for order in range(1, 6)],
+            batch_size=2000
+        )
+        attempts = []
+        for i, u in enumerate(users):
+            for _ in range(options['attempts_per_user']):
+                score = rng.randint(0, 5)
+                attempts.append(QuizAttempt(
+                    user=u, quiz=quizzes[2 * i], score=score, total_questions=5, score_percentage=score * 20,
+                    completed_at=now - timedelta(minutes=rng.randint(0, 500000)),
+                ))
+        QuizAttempt.objects.bulk_create(attempts, batch_size=2000)
+        QuizGenerationJob.objects.bulk_create(
+            [QuizGenerationJob(user=rng.choice(users), topic='T', difficulty='Easy',
+                               status=rng.choice([QuizGenerationJob.STATUS_COMPLETED] * 49
+                                                 + [QuizGenerationJob.STATUS_PENDING]))
+             for _ in range(options['jobs'])],
+            batch_size=2000
+        )
+        SiteTheme.objects.bulk_create(
+            [SiteTheme(name=f'Theme {i}', is_active=(i == 0)) for i in range(options['themes'])]
+        )
+        return users[len(users) // 2], quizzes[len(quizzes) // 2]
+
+    def analyze(self):
+        """Refresh planner statistics so both runs see the same data distribution"""
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def run_queries(self, user, quiz, repeat, title):
+        self.stdout.write(self.style.SUCCESS(title))
+        timings = {}
+        for label, queryset in hot_queries(user, quiz):
+            plan = queryset.explain()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                list(queryset.all())
+            timings[label] = (time.perf_counter() - start) * 1000 / repeat
+            self.stdout.write(f'  {label} ({timings[label]:.3f} ms)')
+            for line in plan.splitlines():
+                self.stdout.write(f'      {line}')
+        return timings
@@ -0,0 +1,115 @@
+"""
+Django management command to benchmark quiz.fast_json against DRF's stdlib JSON.
+
+Creates a throwaway test database (like ``manage.py test``), seeds an attempt
+history and renders representative QuizAttemptSerializer output with DRF's
+JSONRenderer and with FastJSONRenderer, checking that both produce the same
+bytes. Also times parsing a quiz submission body and decoding LLM question
+objects. The configured database is never written to.
+"""
+import io
+import json
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Prefetch
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from quiz import fast_json, grading, services
+from quiz.fast_json import FastJSONParser, FastJSONRenderer
+from quiz.models import QuizAttempt, UserAnswer
+from quiz.serializers import QuizAttemptSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compares the orjson-backed renderer, parser and decoder with the stdlib ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=100)
+        parser.add_argument('--questions', type=int, default=10, help='Questions per quiz')
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        if fast_json.orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed; fast_json uses the stdlib fallback'))
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            history = self.seed(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        mismatches = 0
+        samples = [
+            (f"{options['attempts']}-attempt history", history),
+            ('edge cases', {
+                'when': timezone.now(), 'day': timezone.now().date(), 'duration': timedelta(seconds=90),
+                'price': Decimal('9.99'), 'text': 'line\u2028break हिंदी', 7: 'int key',
+            }),
+        ]
+        for label, data in samples:
+            expected = JSONRenderer().render(data)
+            actual = FastJSONRenderer().render(data)
+            mismatches += expected != actual
+            style = self.style.SUCCESS if expected == actual else self.style.ERROR
+            self.stdout.write(style(f'{label}: {len(actual) / 1024:.1f} KB, identical output: {expected == actual}'))
+
+        self.compare('render history', [
+            ('JSONRenderer', lambda: JSONRenderer().render(history)),
+            ('FastJSONRenderer', lambda: FastJSONRenderer().render(history)),
+        ], options['repeat'])
+
+        body = json.dumps({
+            'quiz_id': 1,
+            'answers': [{'question_id': i, 'selected_option': i % 4} for i in range(20)],
+        }).encode('utf-8')
+        self.compare('parse submission', [
+            ('JSONParser', lambda: JSONParser().parse(io.BytesIO(body))),
+            ('FastJSONParser', lambda: FastJSONParser().parse(io.BytesIO(body))),
+        ], options['repeat'] * 100)
+
+        question = json.dumps(history[0]['answers'][0]['question_details'], ensure_ascii=False)
+        self.compare('decode LLM question', [
+            ('json.loads', lambda: json.loads(question)),
+            ('fast_json.loads', lambda: fast_json.loads(question)),
+        ], options['repeat'] * 100)
+
+        if mismatches:
+            raise CommandError(f'{mismatches} renderings differ from JSONRenderer')
+
+    def compare(self, title, candidates, repeat):
+        self.stdout.write(title)
+        baseline = None
+        for label, func in candidates:
+            func()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                func()
+            elapsed = (time.perf_counter() - started) * 1_000_000 / repeat
+            baseline = baseline or elapsed
+            self.stdout.write(f'  {label:<18} {elapsed:10.1f} us  ({baseline / elapsed:.1f}x)')
+
+    def seed(self, options):
+        user = User.objects.create_user('bench_json')
+        questions = [
+            {
+                'question': f'Which of these statements about sample topic number {i} is accurate?',
+                'options': [f'Plausible answer option {c} for question {i}' for c in 'ABCD'],
+                'correct_index': i % 4,
+                'explanation': f'A one-sentence explanation of why option {i % 4} is the right answer.',
+            }
+            for i in range(options['questions'])
+        ]
+        for i in range(options['attempts']):
+            quiz, created = services.create_quiz(user, f'Topic {i}', 'Medium', 'en', questions)
+            grading.submit_attempt(user, quiz, {question.id: i % 4 for question in created})
+        attempts = QuizAttempt.objects.filter(user=user).select_related('user', 'quiz').prefetch_related(
+            Prefetch('answers', queryset=UserAnswer.objects.select_related('question'))
+        )
+        return QuizAttemptSerializer(attempts, many=True).data
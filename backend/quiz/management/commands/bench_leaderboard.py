@@ -0,0 +1,114 @@
+"""
+Django management command to benchmark the leaderboard sorted sets.
+
+Feeds synthetic attempts (1,000,000 by default) spread over a pool of users
+into the in-process store, or a Redis store with --redis-url, then times
+"top N" and "my rank" lookups against recomputing the ranking with a full
+sort, which is what a plain ORDER BY does for every request. No database
+rows are written.
+"""
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+
+from quiz.leaderboard import RedisStore, _LocalBoard, score_from_key, sort_key
+
+BENCH_BOARD = 'bench:global'
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks leaderboard updates, top N and rank lookups on synthetic attempts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=1_000_000)
+        parser.add_argument('--users', type=int, default=100_000)
+        parser.add_argument('--lookups', type=int, default=10_000, help='Rank lookups to time')
+        parser.add_argument('--top', type=int, default=10)
+        parser.add_argument('--redis-url', help='Benchmark a Redis sorted set instead of the in-process store')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        users = options['users']
+        start_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        attempts = [
+            (rng.randrange(users), min(100, max(0, int(rng.gauss(65, 20)))),
+             start_at + timedelta(seconds=i * 7))
+            for i in range(options['attempts'])
+        ]
+
+        if options['redis_url']:
+            store = RedisStore(options['redis_url'], prefix='mindspark:bench')
+            store.client.delete(store._key(BENCH_BOARD))
+            store.client.set(store._ready_key(BENCH_BOARD), 1)
+            label = 'redis sorted set'
+
+            def add_all():
+                pipe = store.client.pipeline(transaction=False)
+                for i, (user_id, score, achieved_at) in enumerate(attempts, 1):
+                    pipe.zadd(store._key(BENCH_BOARD), {user_id: sort_key(score, achieved_at)}, gt=True)
+                    if i % 10_000 == 0:
+                        pipe.execute()
+                pipe.execute()
+
+            def top():
+                return store.top(BENCH_BOARD, options['top'])
+
+            def rank(user_id):
+                return store.rank(BENCH_BOARD, user_id)
+        else:
+            board = _LocalBoard()
+            label = 'in-process sorted list'
+
+            def add_all():
+                for user_id, score, achieved_at in attempts:
+                    board.add(user_id, sort_key(score, achieved_at))
+
+            def top():
+                return board.top(options['top'])
+
+            def rank(user_id):
+                return board.rank(user_id)
+
+        started = time.perf_counter()
+        add_all()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'{label}: {len(attempts)} attempts over {users} users'))
+        self.stdout.write(f'  updates: {elapsed:.2f}s ({len(attempts) / elapsed:,.0f} attempts/s)')
+
+        started = time.perf_counter()
+        for _ in range(100):
+            leaders = top()
+        self.stdout.write(f'  top {options["top"]}: {(time.perf_counter() - started) * 10:.3f} ms'
+                          f' (best {score_from_key(leaders[0][1])}%)')
+
+        sample = [rng.randrange(users) for _ in range(options['lookups'])]
+        started = time.perf_counter()
+        ranks = [rank(user_id) for user_id in sample]
+        per_lookup = (time.perf_counter() - started) * 1_000_000 / len(sample)
+        self.stdout.write(f'  my rank: {per_lookup:.1f} us per lookup')
+
+        # Baseline: best score per user, then a full sort per request
+        best = {}
+        for user_id, score, achieved_at in attempts:
+            key = sort_key(score, achieved_at)
+            if best.get(user_id, -1) < key:
+                best[user_id] = key
+        started = time.perf_counter()
+        repeats = 20
+        for user_id in sample[:repeats]:
+            ordered = sorted(best, key=lambda u: (-best[u], u))
+        per_sort = (time.perf_counter() - started) * 1000 / repeats
+        self.stdout.write(f'  full sort baseline: {per_sort:.1f} ms per ranking')
+
+        mismatches = sum(
+            1 for user_id, found in zip(sample[:repeats], ranks[:repeats])
+            if (found[0] if found else None) != (ordered.index(user_id) + 1 if user_id in best else None)
+        )
+        style = self.style.SUCCESS if not mismatches else self.style.ERROR
+        self.stdout.write(style(f'  rank mismatches vs baseline: {mismatches}/{repeats}'))
+
+        if options['redis_url']:
+            store.client.delete(store._key(BENCH_BOARD), store._ready_key(BENCH_BOARD))
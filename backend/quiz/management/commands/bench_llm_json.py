@@ -0,0 +1,153 @@
+"""
+Django management command to benchmark and fuzz the LLM JSON extractor.
+
+Runs a corpus of malformed model outputs through the legacy regex extraction
+and quiz.llm_json, reports how many questions each salvages, checks that
+streamed and one-shot parsing agree under random chunking and mutation, and
+times both on a large response.
+"""
+import json
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quiz.llm_json import JSONArrayStreamParser, extract_objects
+
+
+def make_questions(count, offset=0):
+    return [
+        {
+            'question': f'Question {offset + i}: what does "x[{i}]" evaluate to in {{block}}?',
+            'options': [f'Option {c} for {offset + i}' for c in 'ABCD'],
+            'correct_index': i % 4,
+            'explanation': f'Because x[{i}] is \\ indexed, see "docs".',
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_extract(text):
+    """The regex + bracket patching extraction previously used by gemini_service"""
+    text = text.strip()
+    match = re.search(r'\[\s*\{.*\}\s*\]', text, re.DOTALL)
+    if match:
+        json_str = match.group(0)
+    else:
+        json_str = text
+        if not json_str.startswith('['):
+            json_str = '[' + json_str
+        if not json_str.endswith(']'):
+            json_str = json_str + ']'
+    return json.loads(json_str)
+
+
+def build_corpus():
+    """(name, response text, number of complete questions a parser should recover)"""
+    five = make_questions(5)
+    clean = json.dumps(five, indent=2, ensure_ascii=False)
+    items = [json.dumps(q, ensure_ascii=False) for q in five]
+    corpus = [
+        ('clean array', clean, 5),
+        ('code fence with prose', f"Sure! Here are your questions:\n```json\n{clean}\n```\nGood luck!", 5),
+        ('trailing commas', '[\n' + ',\n'.join(i[:-1] + ',}' for i in items) + ',\n]', 5),
+        ('truncated final object', clean[:clean.rindex('"explanation"')], 4),
+        ('brackets in prose', f"Here are [5] questions {{as requested}}:\n{clean}\nLet me know [if] you need more.", 5),
+        ('stray closing bracket', '[' + ',\n'.join(items[:2]) + '],\n' + ',\n'.join(items[2:]) + ']', 5),
+        ('objects without array', '\n\n'.join(items), 5),
+        ('nested array wrapper', f'[{clean}]', 5),
+        ('object wrapper', f'{{"questions": {clean}}}', 5),
+        ('fenced wrapper, trailing comma', f'```json\n{{"quiz": {{"questions": {clean},}}}}\n```', 5),
+        ('stray opening brace in prose', 'Use the format { "question": ... like this:\n' + clean, 5),
+        ('one broken object', '[' + ',\n'.join(items[:2] + ['{"question": "Broken "quote" here", "options": []}'] + items[2:]) + ']', 5),
+        ('hindi text', json.dumps(make_questions(3), ensure_ascii=False).replace('Question', 'प्रश्न'), 3),
+        ('empty response', '', 0),
+        ('prose only', "I'm sorry, I can't help with that.", 0),
+    ]
+    return corpus
+
+
+def parse_streamed(text, rng):
+    """Feed text in random chunk sizes, as a streamed response would arrive"""
+    parser = JSONArrayStreamParser()
+    objects = []
+    pos = 0
+    while pos < len(text):
+        size = rng.randint(1, 64)
+        objects.extend(parser.feed(text[pos:pos + size]))
+        pos += size
+    return objects + parser.close()
+
+
+def mutate(text, rng):
+    """Apply a random corruption typical of LLM output"""
+    kind = rng.choice(['truncate', 'insert', 'delete', 'fence', 'comma'])
+    if not text:
+        return text
+    pos = rng.randrange(len(text))
+    if kind == 'truncate':
+        return text[:pos]
+    if kind == 'insert':
+        return text[:pos] + rng.choice(['[', ']', '{', '}', '"', ',', '\\', '```']) + text[pos:]
+    if kind == 'delete':
+        return text[:pos] + text[pos + 1:]
+    if kind == 'fence':
+        return '```json\n' + text + '\n```'
+    return text.replace('}', '},', 1)
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks and fuzzes the LLM JSON extractor against the legacy regex extraction'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fuzz-cases', type=int, default=2000, help='Number of random mutations to check')
+        parser.add_argument('--seed', type=int, default=1234)
+        parser.add_argument('--iterations', type=int, default=200, help='Timing iterations for the benchmark')
+        parser.add_argument('--questions', type=int, default=100, help='Questions in the benchmark response')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        failures = 0
+
+        self.stdout.write(self.style.SUCCESS('Corpus (questions salvaged: legacy / stream parser / expected)'))
+        for name, text, expected in build_corpus():
+            try:
+                legacy = len(legacy_extract(text))
+            except ValueError:
+                legacy = 0
+            parsed = extract_objects(text)
+            streamed = parse_streamed(text, rng)
+            ok = len(parsed) == expected and streamed == parsed
+            failures += not ok
+            style = self.style.SUCCESS if ok else self.style.ERROR
+            self.stdout.write(style(f'  {name:<30} {legacy:>3} / {len(parsed):>3} / {expected:>3}'))
+
+        base = json.dumps(make_questions(10), indent=2)
+        fuzz_failures = 0
+        for _ in range(options['fuzz_cases']):
+            text = base
+            for _ in range(rng.randint(1, 3)):
+                text = mutate(text, rng)
+            try:
+                one_shot = extract_objects(text)
+                streamed = parse_streamed(text, rng)
+            except Exception as e:
+                fuzz_failures += 1
+                self.stdout.write(self.style.ERROR(f'  parser raised {e!r} on {text[:80]!r}'))
+                continue
+            if one_shot != streamed:
+                fuzz_failures += 1
+        style = self.style.SUCCESS if not fuzz_failures else self.style.ERROR
+        self.stdout.write(style(f"Fuzz: {options['fuzz_cases']} mutated responses, {fuzz_failures} mismatches"))
+
+        large = '```json\n' + json.dumps(make_questions(options['questions']), indent=2) + '\n```'
+        for label, func in [('legacy regex', legacy_extract), ('stream parser', extract_objects)]:
+            start = time.perf_counter()
+            for _ in range(options['iterations']):
+                func(large)
+            elapsed = (time.perf_counter() - start) * 1000 / options['iterations']
+            self.stdout.write(f'{label:<14} {elapsed:8.3f} ms per {len(large) // 1024} KB response')
+
+        if failures or fuzz_failures:
+            raise CommandError(f'{failures} corpus and {fuzz_failures} fuzz failures')
@@ -0,0 +1,96 @@
+"""
+Django management command to load-test the quiz generation pipeline offline.
+
+Runs generation jobs concurrently through quiz.jobs (cache, question bank,
+chunking, streaming and DB writes) against the configured LLM backend, or the
+deterministic FakeBackend with --fake, and reports latency percentiles.
+Run it against a development database: it creates a throwaway user and removes
+it, and everything it generated, afterwards unless --keep is given.
+"""
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import override_settings
+
+from quiz import jobs
+from quiz.models import BankQuestion, QuizGenerationJob
+
+BENCH_USERNAME = 'bench_loadtest'
+TOPIC_PREFIX = 'Load test topic'
+
+
+class Command(BaseCommand):
+    help = 'Runs concurrent quiz generation jobs and reports latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=20)
+        parser.add_argument('--count', type=int, default=10, help='Questions per quiz')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--topics', type=int, default=5, help='Distinct topics to spread jobs over')
+        parser.add_argument('--fresh', action='store_true', help='Bypass the generation cache')
+        parser.add_argument('--fake', action='store_true', help='Use FakeBackend instead of QUIZ_LLM_BACKEND')
+        parser.add_argument('--latency', type=float, default=1.0, help='FakeBackend latency in seconds')
+        parser.add_argument('--jitter', type=float, default=0.3, help='FakeBackend latency jitter in seconds')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='FakeBackend failure probability')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--keep', action='store_true', help='Keep the generated quizzes and bank questions')
+
+    def handle(self, *args, **options):
+        overrides = {}
+        if options['fake']:
+            overrides['QUIZ_LLM_BACKEND'] = {
+                'BACKEND': 'quiz.llm_backends.FakeBackend',
+                'OPTIONS': {
+                    'latency': options['latency'],
+                    'jitter': options['jitter'],
+                    'error_rate': options['error_rate'],
+                    'seed': options['seed'],
+                },
+            }
+
+        user, _ = User.objects.get_or_create(username=BENCH_USERNAME)
+        job_ids = [
+            QuizGenerationJob.objects.create(
+                user=user,
+                topic=f"{TOPIC_PREFIX} {i % options['topics']}",
+                difficulty='Medium',
+                count=options['count'],
+                fresh=options['fresh'],
+            ).id
+            for i in range(options['jobs'])
+        ]
+
+        def timed_run(job_id):
+            start = time.perf_counter()
+            try:
+                jobs.run_job(job_id)
+            finally:
+                connections.close_all()
+            return time.perf_counter() - start
+
+        with override_settings(**overrides):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                durations = sorted(executor.map(timed_run, job_ids))
+            wall = time.perf_counter() - started
+
+        statuses = QuizGenerationJob.objects.filter(id__in=job_ids).values_list('status', flat=True)
+        completed = sum(1 for status in statuses if status == QuizGenerationJob.STATUS_COMPLETED)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['jobs']} jobs x {options['count']} questions, concurrency {options['concurrency']}"
+        ))
+        self.stdout.write(f'  completed: {completed}, failed: {len(job_ids) - completed}')
+        self.stdout.write(f'  wall time: {wall:.2f}s ({len(job_ids) / wall:.1f} jobs/s)')
+        p95 = durations[max(0, round(len(durations) * 0.95) - 1)]
+        self.stdout.write(
+            f'  latency p50 {statistics.median(durations):.3f}s, p95 {p95:.3f}s, max {durations[-1]:.3f}s'
+        )
+
+        if not options['keep']:
+            user.delete()
+            BankQuestion.objects.filter(topic__startswith=TOPIC_PREFIX).delete()
@@ -0,0 +1,85 @@
+"""
+Django management command to benchmark attempt history serialization.
+
+Creates a throwaway test database (like ``manage.py test``), seeds one user
+with an attempt history (100 attempts by default), then serializes it with
+the ModelSerializer path (QuizAttemptSerializer over prefetched instances)
+and with the values()-based AttemptRows path, reporting queries, time and
+rendered JSON size for each. The configured database is never written to.
+"""
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Prefetch
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from quiz import grading, services
+from quiz.models import QuizAttempt, UserAnswer
+from quiz.serializers import AttemptRows, QuizAttemptSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compares ModelSerializer and row serializer time and payload size for an attempt history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=100)
+        parser.add_argument('--questions', type=int, default=10, help='Questions per quiz')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            user = self.seed(options)
+            history = QuizAttempt.objects.filter(user=user).order_by('-completed_at', '-id')
+
+            def model_serializer():
+                attempts = history.select_related('user', 'quiz').prefetch_related(
+                    Prefetch('answers', queryset=UserAnswer.objects.select_related('question')
+                             .order_by('question__order'))
+                )
+                return QuizAttemptSerializer(attempts, many=True).data
+
+            def rows(fields=None):
+                def run():
+                    serializer = AttemptRows(fields=fields)
+                    return serializer.serialize(serializer.values(history))
+                return run
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{options['attempts']} attempts x {options['questions']} answers"
+            ))
+            for label, func in [
+                ('ModelSerializer', model_serializer),
+                ('AttemptRows', rows()),
+                ('AttemptRows ?fields=', rows({'id', 'quiz_topic', 'score_percentage', 'completed_at'})),
+            ]:
+                with CaptureQueriesContext(connection) as queries:
+                    payload = JSONRenderer().render(func())
+                started = time.perf_counter()
+                for _ in range(options['repeat']):
+                    JSONRenderer().render(func())
+                elapsed = (time.perf_counter() - started) * 1000 / options['repeat']
+                self.stdout.write(
+                    f'  {label:<22} {len(queries)} queries  {elapsed:8.2f} ms  {len(payload) / 1024:8.1f} KB'
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def seed(self, options):
+        user = User.objects.create_user('bench_serializers')
+        questions = [
+            {
+                'question': f'Which of these statements about sample topic number {i} is accurate?',
+                'options': [f'Plausible answer option {c} for question {i}' for c in 'ABCD'],
+                'correct_index': i % 4,
+                'explanation': f'A one-sentence explanation of why option {i % 4} is the right answer.',
+            }
+            for i in range(options['questions'])
+        ]
+        for i in range(options['attempts']):
+            quiz, created = services.create_quiz(user, f'Topic {i}', 'Medium', 'en', questions)
+            grading.submit_attempt(user, quiz, {question.id: i % 4 for question in created})
+        return user
@@ -0,0 +1,121 @@
+"""
+Django management command guarding the REST API against N+1 regressions.
+
+Creates a throwaway test database (like ``manage.py test``), seeds a user
+with full pages of quizzes and attempts, calls every endpoint of
+quiz.api_views through the test client and compares the number of SQL
+queries with EXPECTED_QUERIES. Exits with an error on any difference, so it
+can run in CI. The configured database is never written to.
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from quiz import grading, jobs, leaderboard, services
+from quiz.models import QuizGenerationJob, SiteStats, UserProfile
+
+# Includes the token lookup that authenticates each request
+EXPECTED_QUERIES = {
+    'auth/me': 2,
+    'quiz/generate': 2,
+    'quiz/job': 4,
+    'quiz/submit': 13,
+    'quizzes/my_quizzes': 3,
+    'quizzes/detail': 4,
+    'quizzes/detail 304': 2,
+    'attempts/my_history': 3,
+    'attempts/detail': 4,
+    'attempts/detail 304': 2,
+    'attempts/stats': 2,
+    'admin/dashboard': 5,
+}
+
+FAKE_BACKEND = {'BACKEND': 'quiz.llm_backends.FakeBackend', 'OPTIONS': {}}
+
+
+class Command(BaseCommand):
+    help = 'Checks the number of queries each REST API endpoint runs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=30,
+                            help='Quizzes and attempts to seed (more than a page)')
+        parser.add_argument('--questions', type=int, default=10)
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(QUIZ_LLM_BACKEND=FAKE_BACKEND, QUIZ_GENERATION_CACHE={'MAX_ENTRIES': 0},
+                                   QUIZ_JOB_MODE='db', QUIZ_LEADERBOARD_SYNC_INTERVAL=3600):
+                failures = self.check_endpoints(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        if failures:
+            raise CommandError(f'{failures} endpoint(s) ran an unexpected number of queries')
+
+    def seed(self, options):
+        user = User.objects.create_user('api_check', 'api_check@example.com', 'x')
+        admin = User.objects.create_user('api_admin', 'api_admin@example.com', 'x')
+        UserProfile.objects.filter(user=admin).update(is_admin=True)
+        questions = [
+            {'question': f'Question {i}', 'options': ['A', 'B', 'C', 'D'], 'correct_index': i % 4,
+             'explanation': f'Because {i}'}
+            for i in range(options['questions'])
+        ]
+        quizzes, attempts = [], []
+        for i in range(options['rows']):
+            quiz, created = services.create_quiz(user, f'Topic {i}', 'Easy', 'en', questions)
+            quizzes.append(quiz)
+            attempts.append(grading.submit_attempt(user, quiz, {question.id: 0 for question in created})[0])
+        job = QuizGenerationJob.objects.create(user=user, topic='Query check', difficulty='Easy', count=5)
+        jobs.run_job(job.id)
+        # Measure steady state: the stats row exists and the leaderboard is loaded
+        SiteStats.get()
+        leaderboard.top(leaderboard.GLOBAL)
+        return user, admin, quizzes, attempts, job
+
+    def check_endpoints(self, options):
+        user, admin, quizzes, attempts, job = self.seed(options)
+        client = APIClient()
+        admin_client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        admin_client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=admin).key}')
+        quiz = quizzes[0]
+        answers = [{'question_id': question.id, 'selected_option': 1} for question in quiz.questions.all()]
+        quiz_url, attempt_url = f'/api/quizzes/{quiz.id}/', f'/api/attempts/{attempts[0].id}/'
+        quiz_etag, attempt_etag = client.get(quiz_url)['ETag'], client.get(attempt_url)['ETag']
+
+        calls = [
+            ('auth/me', lambda: client.get('/api/auth/me/')),
+            ('quiz/generate', lambda: client.post(
+                '/api/quiz/generate/', {'topic': 'Query check', 'difficulty': 'Easy', 'count': 5}, format='json')),
+            ('quiz/job', lambda: client.get(f'/api/quiz/jobs/{job.id}/')),
+            ('quiz/submit', lambda: client.post(
+                '/api/quiz/submit/', {'quiz_id': quiz.id, 'answers': answers}, format='json')),
+            ('quizzes/my_quizzes', lambda: client.get('/api/quizzes/my_quizzes/')),
+            ('quizzes/detail', lambda: client.get(quiz_url)),
+            ('quizzes/detail 304', lambda: client.get(quiz_url, HTTP_IF_NONE_MATCH=quiz_etag)),
+            ('attempts/my_history', lambda: client.get('/api/attempts/my_history/')),
+            ('attempts/detail', lambda: client.get(attempt_url)),
+            ('attempts/detail 304', lambda: client.get(attempt_url, HTTP_IF_NONE_MATCH=attempt_etag)),
+            ('attempts/stats', lambda: client.get('/api/attempts/stats/')),
+            ('admin/dashboard', lambda: admin_client.get('/api/admin/dashboard/')),
+        ]
+
+        failures = 0
+        for label, call in calls:
+            with CaptureQueriesContext(connection) as queries:
+                response = call()
+            expected = EXPECTED_QUERIES[label]
+            ok = response.status_code < 400 and len(queries) == expected
+            failures += not ok
+            style = self.style.SUCCESS if ok else self.style.ERROR
+            self.stdout.write(style(
+                f'  {label:<22} {response.status_code}  {len(queries):>3} queries (expected {expected})'
+            ))
+            if not ok and options['verbosity'] > 1:
+                for query in queries.captured_queries:
+                    self.stdout.write(f"      {query['sql'][:160]}")
+        return failures
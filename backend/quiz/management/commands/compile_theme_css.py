@@ -0,0 +1,17 @@
+"""
+Django management command to compile the active theme stylesheet.
+Run it after collectstatic so whitenoise serves the file from startup.
+"""
+from django.core.management.base import BaseCommand
+
+from quiz import theme_css
+from quiz.models import SiteTheme
+
+
+class Command(BaseCommand):
+    help = 'Compiles the active SiteTheme to a fingerprinted CSS file in STATIC_ROOT'
+
+    def handle(self, *args, **options):
+        theme = SiteTheme.get_active_theme()
+        url = theme_css.compile_theme(theme)
+        self.stdout.write(self.style.SUCCESS(f'Compiled theme "{theme.name}" to {url}'))
@@ -0,0 +1,32 @@
+"""
+Django management command to export certificates in bulk.
+Writes a zip archive with the PDF and/or PNG certificate of every matching
+attempt, rendering missing ones in the certificate pool. For exports too
+large for the QuizAttempt admin action.
+"""
+from django.core.management.base import BaseCommand
+
+from quiz import certificates
+from quiz.models import QuizAttempt
+
+
+class Command(BaseCommand):
+    help = 'Exports quiz attempt certificates to a zip archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Path of the zip archive to write')
+        parser.add_argument('--format', choices=[*certificates.FORMATS, 'all'], default='pdf')
+        parser.add_argument('--user', help='Only attempts by this username')
+        parser.add_argument('--min-score', type=float, default=0, help='Minimum score percentage')
+
+    def handle(self, *args, **options):
+        attempts = QuizAttempt.objects.select_related('user', 'quiz').filter(
+            score_percentage__gte=options['min_score']
+        ).order_by('id')
+        if options['user']:
+            attempts = attempts.filter(user__username=options['user'])
+        formats = list(certificates.FORMATS) if options['format'] == 'all' else [options['format']]
+
+        with open(options['output'], 'wb') as f:
+            exported = certificates.export_zip(attempts, formats, f)
+        self.stdout.write(self.style.SUCCESS(f"Exported {exported} certificate(s) to {options['output']}"))
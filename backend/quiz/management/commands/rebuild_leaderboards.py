@@ -0,0 +1,16 @@
+"""
+Django management command to rebuild every leaderboard from recorded attempts.
+Leaderboards are updated incrementally on every submission; run this after
+bulk deletes of attempts or users, or to repair drift.
+"""
+from django.core.management.base import BaseCommand
+
+from quiz import leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Recomputes all leaderboard entries from quiz attempts'
+
+    def handle(self, *args, **options):
+        entries = leaderboard.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {entries} leaderboard entries'))
@@ -0,0 +1,30 @@
+"""
+Django management command to rebuild UserProfile statistics from attempts.
+Profiles are updated incrementally on every submission; run this after a
+backfill, bulk deletes of attempts, or to repair drift.
+"""
+from django.core.management.base import BaseCommand
+
+from quiz.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = 'Recomputes profile quiz statistics from recorded attempts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Profiles aggregated per query')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        checked = changed = 0
+        last_id = 0
+        while True:
+            batch = list(UserProfile.objects.filter(id__gt=last_id).order_by('id')[:batch_size])
+            if not batch:
+                break
+            changed += len(UserProfile.recompute_stats(batch))
+            checked += len(batch)
+            last_id = batch[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f'Checked {checked} profiles, corrected {changed}'))
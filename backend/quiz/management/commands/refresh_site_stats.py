@@ -0,0 +1,24 @@
+"""
+Django management command to reconcile the admin dashboard statistics.
+Counters are bumped incrementally when users, quizzes and attempts are
+created; run this periodically (e.g. from cron) to account for deletions and
+repair drift.
+"""
+from django.core.management.base import BaseCommand
+
+from quiz.models import SiteStats
+
+
+class Command(BaseCommand):
+    help = 'Recounts the site-wide statistics shown on the admin dashboard'
+
+    def handle(self, *args, **options):
+        stats, _ = SiteStats.objects.get_or_create(pk=SiteStats.SINGLETON_PK)
+        before = (stats.total_users, stats.total_quizzes, stats.total_attempts)
+        stats.reconcile()
+        after = (stats.total_users, stats.total_quizzes, stats.total_attempts)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Users {after[0]}, quizzes {after[1]}, attempts {after[2]}'
+            f' (drift {after[0] - before[0]:+d} / {after[1] - before[1]:+d} / {after[2] - before[2]:+d})'
+        ))
@@ -0,0 +1,39 @@
+"""
+Django management command to process queued quiz generation jobs.
+Use it as a dedicated worker when QUIZ_JOB_MODE is 'db', or to recover
+jobs left behind by a restarted web process.
+"""
+from datetime import timedelta
+import time
+
+from django.core.management.base import BaseCommand
+
+from quiz import jobs
+
+
+class Command(BaseCommand):
+    help = 'Runs pending quiz generation jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep polling for new jobs instead of exiting when the queue is empty')
+        parser.add_argument('--interval', type=float, default=2.0,
+                            help='Seconds to sleep between polls in --loop mode')
+        parser.add_argument('--limit', type=int, default=None,
+                            help='Maximum number of jobs to run per pass')
+        parser.add_argument('--stale-minutes', type=int, default=10,
+                            help='Requeue jobs that have been running longer than this')
+
+    def handle(self, *args, **options):
+        while True:
+            requeued = jobs.requeue_stale_jobs(timedelta(minutes=options['stale_minutes']))
+            if requeued:
+                self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale job(s)'))
+
+            executed = jobs.run_pending_jobs(limit=options['limit'])
+            if executed:
+                self.stdout.write(self.style.SUCCESS(f'Ran {executed} job(s)'))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
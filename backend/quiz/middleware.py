@@ -0,0 +1,12 @@
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .theme_css import FILENAME_PATTERN
+
+
+class QuizWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise that also serves compiled theme stylesheets with far-future headers"""
+
+    def immutable_file_test(self, path, url):
+        if FILENAME_PATTERN.search(url):
+            return True
+        return super().immutable_file_test(path, url)
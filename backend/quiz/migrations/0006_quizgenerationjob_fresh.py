@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 20:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0005_quizgenerationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='fresh',
+            field=models.BooleanField(default=False, help_text='Skip cached question sets'),
+        ),
+    ]
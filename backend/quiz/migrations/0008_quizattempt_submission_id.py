@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 20:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0007_bankquestion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizattempt',
+            name='submission_id',
+            field=models.UUIDField(blank=True, editable=False, help_text='Client token that makes quiz submission idempotent', null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0 on 2026-10-18 20:23
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_score_sums(apps, schema_editor):
+    """Seed the running total from existing attempts, one aggregate query"""
+    UserProfile = apps.get_model('quiz', 'UserProfile')
+    QuizAttempt = apps.get_model('quiz', 'QuizAttempt')
+    totals = QuizAttempt.objects.values('user_id').annotate(total=Sum('score_percentage'))
+    for row in totals.iterator():
+        UserProfile.objects.filter(user_id=row['user_id']).update(score_percentage_sum=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0008_quizattempt_submission_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='score_percentage_sum',
+            field=models.BigIntegerField(default=0, help_text='Running total used for average_score'),
+        ),
+        migrations.RunPython(backfill_score_sums, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0 on 2026-10-18 20:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def deactivate_extra_themes(apps, schema_editor):
+    """Keep only the most recently updated active theme before enforcing uniqueness"""
+    SiteTheme = apps.get_model('quiz', 'SiteTheme')
+    active = SiteTheme.objects.filter(is_active=True).order_by('-updated_at', '-pk')
+    keep = active.values_list('pk', flat=True).first()
+    if keep is not None:
+        SiteTheme.objects.filter(is_active=True).exclude(pk=keep).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0009_userprofile_score_percentage_sum'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(deactivate_extra_themes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['quiz', 'order'], name='quiz_question_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['user', '-created_at'], name='quiz_quiz_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['user', '-completed_at'], name='quiz_attempt_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['-completed_at'], name='quiz_attempt_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizgenerationjob',
+            index=models.Index(fields=['status', 'created_at'], name='quiz_job_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['-best_score'], name='quiz_profile_best_score_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='sitetheme',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('is_active',), name='quiz_single_active_theme'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0 on 2026-10-18 20:31
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_question_counts(apps, schema_editor):
+    """Set every quiz's count with a single correlated UPDATE"""
+    Quiz = apps.get_model('quiz', 'Quiz')
+    Question = apps.get_model('quiz', 'Question')
+    counts = (Question.objects.filter(quiz=OuterRef('pk')).order_by()
+              .values('quiz').annotate(total=Count('pk')).values('total'))
+    Quiz.objects.update(question_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0011_attempt_history_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='question_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Maintained when questions are added or removed'),
+        ),
+        migrations.RunPython(backfill_question_counts, migrations.RunPython.noop),
+    ]
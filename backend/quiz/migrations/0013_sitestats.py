@@ -0,0 +1,27 @@
+# Generated by Django 5.0 on 2026-10-18 20:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0012_quiz_question_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_users', models.BigIntegerField(default=0)),
+                ('total_quizzes', models.BigIntegerField(default=0)),
+                ('total_attempts', models.BigIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(blank=True, help_text='Last full reconcile', null=True)),
+            ],
+            options={
+                'verbose_name': 'Site statistics',
+                'verbose_name_plural': 'Site statistics',
+            },
+        ),
+    ]
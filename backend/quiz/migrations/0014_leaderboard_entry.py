@@ -0,0 +1,58 @@
+# Generated by Django 5.0 on 2026-10-18 20:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_leaderboards(apps, schema_editor):
+    """Best score per board and user from existing attempts, earliest achievement kept on ties"""
+    QuizAttempt = apps.get_model('quiz', 'QuizAttempt')
+    LeaderboardEntry = apps.get_model('quiz', 'LeaderboardEntry')
+    rows = QuizAttempt.objects.order_by('completed_at', 'id').values_list(
+        'user_id', 'score_percentage', 'completed_at', 'quiz__difficulty', 'quiz__language'
+    )
+    best = {}
+    for user_id, score, completed_at, difficulty, language in rows.iterator(chunk_size=1000):
+        year, week, _ = timezone.localtime(completed_at).isocalendar()
+        for board in ('global', f'difficulty:{difficulty}', f'language:{language}', f'weekly:{year}-W{week:02d}'):
+            current = best.get((board, user_id))
+            if current is None or score > current[0]:
+                best[(board, user_id)] = (score, completed_at)
+    now = timezone.now()
+    LeaderboardEntry.objects.bulk_create([
+        LeaderboardEntry(board=board, user_id=user_id, best_score=score, achieved_at=achieved_at, updated_at=now)
+        for (board, user_id), (score, achieved_at) in best.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0013_sitestats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(max_length=40)),
+                ('best_score', models.IntegerField()),
+                ('achieved_at', models.DateTimeField(help_text='When best_score was first reached; earlier ranks higher')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', '-best_score', 'achieved_at'], name='quiz_leaderboard_rank_idx'), models.Index(fields=['board', 'updated_at'], name='quiz_leaderboard_sync_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('board', 'user'), name='quiz_leaderboard_entry_unique'),
+        ),
+        migrations.RunPython(backfill_leaderboards, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Count, F, FloatField, Max, Sum, Value
+from django.db.models.functions import Cast, Greatest
 from django.contrib.auth.models import User
 from django.utils import timezone
 
@@ -21,22 +23,60 @@ class Quiz(models.Model):
     difficulty = models.CharField(max_length=10, choices=DIFFICULTY_CHOICES)
     language = models.CharField(max_length=2, choices=LANGUAGE_CHOICES, default='en')
     created_at = models.DateTimeField(default=timezone.now)
+    question_count = models.PositiveIntegerField(default=0, editable=False,
+                                                 help_text="Maintained when questions are added or removed")
     
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = 'Quizzes'
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='quiz_quiz_user_recent_idx'),
+        ]
     
     def __str__(self):
         return f"{self.topic} - {self.difficulty} ({self.user.username})"
     
     @property
     def total_questions(self):
-        return self.questions.count()
+        return self.question_count
+
+
+class BankQuestion(models.Model):
+    """Deduplicated question shared across quizzes on the same topic"""
+    content_hash = models.CharField(max_length=64, unique=True)
+    topic = models.CharField(max_length=200)
+    topic_key = models.CharField(max_length=200, help_text="Normalized topic used for lookups")
+    difficulty = models.CharField(max_length=10, choices=Quiz.DIFFICULTY_CHOICES)
+    language = models.CharField(max_length=2, choices=Quiz.LANGUAGE_CHOICES, default='en')
+    question_text = models.TextField()
+    option_a = models.CharField(max_length=500)
+    option_b = models.CharField(max_length=500)
+    option_c = models.CharField(max_length=500)
+    option_d = models.CharField(max_length=500)
+    correct_option = models.IntegerField(choices=[(0, 'A'), (1, 'B'), (2, 'C'), (3, 'D')])
+    explanation = models.TextField()
+    times_served = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['topic_key', 'difficulty', 'language'], name='quiz_bank_lookup_idx'),
+        ]
+
+    def __str__(self):
+        return f"[{self.topic} / {self.difficulty}] {self.question_text[:50]}..."
+
+    @property
+    def options(self):
+        return [self.option_a, self.option_b, self.option_c, self.option_d]
 
 
 class Question(models.Model):
     """Model to store quiz questions"""
     quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='questions')
+    bank_question = models.ForeignKey(BankQuestion, on_delete=models.SET_NULL, null=True, blank=True,
+                                      related_name='quiz_questions')
     question_text = models.TextField()
     option_a = models.CharField(max_length=500)
     option_b = models.CharField(max_length=500)
@@ -48,6 +88,9 @@ class Question(models.Model):
     
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['quiz', 'order'], name='quiz_question_order_idx'),
+        ]
     
     def __str__(self):
         return f"Q{self.order}: {self.question_text[:50]}..."
@@ -65,9 +108,17 @@ class QuizAttempt(models.Model):
     total_questions = models.IntegerField()
     score_percentage = models.IntegerField()
     completed_at = models.DateTimeField(default=timezone.now)
+    submission_id = models.UUIDField(null=True, blank=True, unique=True, editable=False,
+                                     help_text="Client token that makes quiz submission idempotent")
     
     class Meta:
         ordering = ['-completed_at']
+        indexes = [
+            # Profile history: one user's attempts, newest first, keyset-paginated on (completed_at, id)
+            models.Index(fields=['user', '-completed_at', '-id'], name='quiz_attempt_user_history_idx'),
+            # Admin dashboard: latest attempts site-wide
+            models.Index(fields=['-completed_at'], name='quiz_attempt_recent_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.quiz.topic} - {self.score_percentage}%"
@@ -92,18 +143,173 @@ class UserProfile(models.Model):
     total_quizzes_taken = models.IntegerField(default=0)
     average_score = models.FloatField(default=0.0)
     best_score = models.IntegerField(default=0)
+    score_percentage_sum = models.BigIntegerField(default=0, help_text="Running total used for average_score")
     
+    STATS_FIELDS = ['total_quizzes_taken', 'average_score', 'best_score', 'score_percentage_sum']
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-best_score'], name='quiz_profile_best_score_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username}'s Profile"
     
+    @classmethod
+    def record_attempt(cls, user_id, score_percentage):
+        """
+        Fold one new attempt into the running statistics with a single UPDATE.
+        Returns the number of profiles updated (0 if the user has none yet).
+        """
+        new_total = F('total_quizzes_taken') + 1
+        new_sum = F('score_percentage_sum') + score_percentage
+        return cls.objects.filter(user_id=user_id).update(
+            total_quizzes_taken=new_total,
+            score_percentage_sum=new_sum,
+            average_score=Cast(new_sum, FloatField()) / Cast(new_total, FloatField()),
+            best_score=Greatest(F('best_score'), Value(score_percentage)),
+        )
+
+    @classmethod
+    def recompute_stats(cls, profiles):
+        """
+        Recalculate statistics for a batch of profiles from their attempts with
+        one aggregate query and one bulk UPDATE; returns the profiles that changed.
+        """
+        profiles = list(profiles)
+        totals = {
+            row['user_id']: row
+            for row in QuizAttempt.objects.filter(user_id__in=[p.user_id for p in profiles])
+            .values('user_id')
+            .annotate(count=Count('id'), total=Sum('score_percentage'), best=Max('score_percentage'))
+        }
+        changed = []
+        for profile in profiles:
+            row = totals.get(profile.user_id, {'count': 0, 'total': 0, 'best': 0})
+            stats = {
+                'total_quizzes_taken': row['count'],
+                'score_percentage_sum': row['total'],
+                'average_score': row['total'] / row['count'] if row['count'] else 0.0,
+                'best_score': row['best'],
+            }
+            if any(getattr(profile, field) != value for field, value in stats.items()):
+                for field, value in stats.items():
+                    setattr(profile, field, value)
+                changed.append(profile)
+        if changed:
+            cls.objects.bulk_update(changed, cls.STATS_FIELDS)
+        return changed
+
     def update_stats(self):
         """Update user statistics"""
-        attempts = self.user.quiz_attempts.all()
-        if attempts.exists():
-            self.total_quizzes_taken = attempts.count()
-            self.average_score = sum(a.score_percentage for a in attempts) / attempts.count()
-            self.best_score = max(a.score_percentage for a in attempts)
-            self.save()
+        self.recompute_stats([self])
+
+
+class QuizGenerationJob(models.Model):
+    """Model to track quiz generation running outside the request cycle"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='generation_jobs')
+    topic = models.CharField(max_length=200)
+    difficulty = models.CharField(max_length=10, choices=Quiz.DIFFICULTY_CHOICES)
+    count = models.PositiveSmallIntegerField(default=5)
+    language = models.CharField(max_length=2, choices=Quiz.LANGUAGE_CHOICES, default='en')
+    fresh = models.BooleanField(default=False, help_text="Skip cached question sets")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    quiz = models.ForeignKey(Quiz, on_delete=models.SET_NULL, null=True, blank=True, related_name='generation_jobs')
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # run_quiz_jobs: pending jobs oldest first
+            models.Index(fields=['status', 'created_at'], name='quiz_job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} - {self.difficulty} [{self.status}] ({self.user.username})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_COMPLETED, self.STATUS_FAILED)
+
+
+class LeaderboardEntry(models.Model):
+    """A user's best score on one leaderboard (see quiz.leaderboard)"""
+    board = models.CharField(max_length=40)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    best_score = models.IntegerField()
+    achieved_at = models.DateTimeField(help_text="When best_score was first reached; earlier ranks higher")
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'user'], name='quiz_leaderboard_entry_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['board', '-best_score', 'achieved_at'], name='quiz_leaderboard_rank_idx'),
+            # In-process leaderboards re-sync rows changed by other workers
+            models.Index(fields=['board', 'updated_at'], name='quiz_leaderboard_sync_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.board}: {self.user.username} {self.best_score}%"
+
+
+class SiteStats(models.Model):
+    """
+    Single-row rollup of site-wide counters for the admin dashboard.
+
+    Counters are bumped with one UPDATE when a user, quiz or attempt is
+    created; deletions are left to reconcile(), run by the refresh_site_stats
+    command. The dashboard's top performers come from quiz.leaderboard.
+    """
+    SINGLETON_PK = 1
+
+    total_users = models.BigIntegerField(default=0)
+    total_quizzes = models.BigIntegerField(default=0)
+    total_attempts = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField(null=True, blank=True, help_text="Last full reconcile")
+
+    class Meta:
+        verbose_name = "Site statistics"
+        verbose_name_plural = "Site statistics"
+
+    def __str__(self):
+        return f"Site statistics (refreshed {self.refreshed_at or 'never'})"
+
+    @classmethod
+    def get(cls):
+        """The stats row, reconciled from the live tables on first use"""
+        stats, created = cls.objects.get_or_create(pk=cls.SINGLETON_PK)
+        if created:
+            stats.reconcile()
+        return stats
+
+    @classmethod
+    def increment(cls, field):
+        return cls.objects.filter(pk=cls.SINGLETON_PK).update(**{field: F(field) + 1})
+
+    def reconcile(self):
+        """Recount everything from the live tables"""
+        self.total_users = User.objects.count()
+        self.total_quizzes = Quiz.objects.count()
+        self.total_attempts = QuizAttempt.objects.count()
+        self.refreshed_at = timezone.now()
+        self.save()
 
 
 class SiteTheme(models.Model):
@@ -202,10 +408,20 @@ class SiteTheme(models.Model):
         ordering = ['-is_active', '-updated_at']
         verbose_name = 'Site Theme'
         verbose_name_plural = 'Site Themes'
+        constraints = [
+            # Partial unique index: at most one active theme, and a tiny index for the lookup
+            models.UniqueConstraint(fields=['is_active'], condition=models.Q(is_active=True),
+                                    name='quiz_single_active_theme'),
+        ]
     
     def __str__(self):
         return f"{self.name} {'(Active)' if self.is_active else ''}"
     
+    def validate_constraints(self, exclude=None):
+        # Activating a theme is valid: save() deactivates the current one first
+        exclude = set(exclude or ()) | {'is_active'}
+        super().validate_constraints(exclude=exclude)
+    
     def save(self, *args, **kwargs):
         # Ensure only one theme is active
         if self.is_active:
@@ -0,0 +1,60 @@
+"""
+Whole-response caching for anonymous pages
+
+A cached page is keyed on the active theme and homepage content versions, so
+editing either in the admin changes the key and the next visitor gets a fresh
+render. Responses carry an ETag and Last-Modified; conditional requests from
+browsers and CDNs are answered with 304 without rendering anything.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from . import cache_versions
+from . import homepage_cache
+from . import theme_cache
+
+
+def content_version(cache=None) -> str:
+    """Combined version of everything an anonymous page is rendered from"""
+    return '.'.join([
+        cache_versions.get_version(theme_cache.NAMESPACE, cache),
+        cache_versions.get_version(homepage_cache.NAMESPACE, cache),
+    ])
+
+
+def cached_anonymous_page(request, name: str, render_page):
+    """
+    Return the cached response for page ``name``, calling ``render_page()`` on
+    a miss. Only use it for pages whose output does not depend on the visitor.
+    """
+    cache = cache_versions.get_cache()
+    key = cache_versions.versioned_key('pages', name, content_version(cache))
+    entry = cache.get(key)
+    if entry is None:
+        rendered = render_page()
+        if rendered.status_code != 200:
+            return rendered
+        entry = {
+            'content': rendered.content,
+            'content_type': rendered['Content-Type'],
+            'etag': f'"{hashlib.md5(rendered.content).hexdigest()}"',
+            'last_modified': int(time.time()),
+        }
+        cache.set(key, entry, timeout=getattr(settings, 'PAGE_CACHE_TIMEOUT', 600))
+
+    response = get_conditional_response(
+        request, etag=entry['etag'], last_modified=entry['last_modified']
+    )
+    if response is None:
+        response = HttpResponse(entry['content'], content_type=entry['content_type'])
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'])
+    # Signed-in visitors are redirected from the same URL, so shared caches must vary on the session
+    patch_vary_headers(response, ['Cookie'])
+    patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
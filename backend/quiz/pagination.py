@@ -0,0 +1,45 @@
+"""
+Keyset (cursor) pagination for newest-first lists
+
+Instead of OFFSET, each page continues strictly after the last row of the
+previous one on a (timestamp, id) key, so every page costs one index range
+scan no matter how deep the user has scrolled. Cursors are opaque URL-safe
+strings encoding that key.
+"""
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(timestamp: datetime, pk: int) -> str:
+    raw = f'{timestamp.isoformat()}|{pk}'.encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    """(timestamp, pk) from a cursor; raises ValueError if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, pk = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8').split('|')
+        return datetime.fromisoformat(timestamp), int(pk)
+    except (UnicodeError, TypeError, ValueError) as e:
+        raise ValueError(f'Invalid cursor: {cursor!r}') from e
+
+
+def keyset_page(queryset, cursor=None, page_size=20, field='completed_at'):
+    """
+    Return (items, next_cursor) for ``queryset`` ordered newest first on
+    (``field``, id). ``next_cursor`` is None on the last page.
+    """
+    queryset = queryset.order_by(f'-{field}', '-pk')
+    if cursor:
+        timestamp, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(**{f'{field}__lt': timestamp}) | Q(**{field: timestamp, 'pk__lt': pk}))
+
+    items = list(queryset[:page_size + 1])
+    if len(items) <= page_size:
+        return items, None
+    items = items[:page_size]
+    last = items[-1]
+    return items, encode_cursor(getattr(last, field), last.pk)
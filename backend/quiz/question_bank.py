@@ -0,0 +1,112 @@
+"""
+Shared question bank
+
+Generated questions are stored once in BankQuestion, keyed by a hash of the
+normalized question text and options, and tagged with topic, difficulty and
+language. New quizzes are assembled by sampling from the bank; the LLM is only
+asked for the questions a topic is still missing.
+"""
+import hashlib
+import random
+
+from django.db.models import F
+
+from .generation_cache import normalize_topic
+from .models import BankQuestion, Question
+
+
+def _normalize_text(text) -> str:
+    return ' '.join(str(text).split()).casefold()
+
+
+def question_hash(question: dict) -> str:
+    """
+    Content hash of a question dict. Options are sorted so the same question
+    with shuffled answers is still recognised as a duplicate.
+    """
+    options = sorted(_normalize_text(option) for option in question['options'])
+    raw = '\x1f'.join([_normalize_text(question['question'])] + options)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def to_question_dict(bank_question: BankQuestion) -> dict:
+    """Convert a bank row into the dict format returned by gemini_service"""
+    return {
+        'question': bank_question.question_text,
+        'options': bank_question.options,
+        'correct_index': bank_question.correct_option,
+        'explanation': bank_question.explanation,
+        'bank_question_id': bank_question.id,
+    }
+
+
+def add_questions(questions: list, topic: str, difficulty: str, language: str = 'en') -> list:
+    """
+    Store generated questions in the bank, skipping duplicates.
+    Returns the bank rows in input order (existing rows for duplicates).
+    """
+    topic_key = normalize_topic(topic)
+    rows = {}
+    for q in questions:
+        content_hash = question_hash(q)
+        if content_hash in rows:
+            continue
+        rows[content_hash] = BankQuestion(
+            content_hash=content_hash,
+            topic=topic,
+            topic_key=topic_key,
+            difficulty=difficulty,
+            language=language,
+            question_text=q['question'],
+            option_a=q['options'][0],
+            option_b=q['options'][1],
+            option_c=q['options'][2],
+            option_d=q['options'][3],
+            correct_option=q['correct_index'],
+            explanation=q['explanation'],
+        )
+
+    BankQuestion.objects.bulk_create(rows.values(), ignore_conflicts=True)
+    stored = BankQuestion.objects.in_bulk(rows.keys(), field_name='content_hash')
+    return [stored[content_hash] for content_hash in rows if content_hash in stored]
+
+
+def sample(topic: str, difficulty: str, count: int, language: str = 'en', user=None) -> list:
+    """
+    Pick up to ``count`` random bank questions for a topic. Questions the user
+    has already been served in earlier quizzes are excluded.
+    """
+    candidates = BankQuestion.objects.filter(
+        topic_key=normalize_topic(topic),
+        difficulty=difficulty,
+        language=language,
+    )
+    if user is not None:
+        candidates = candidates.exclude(id__in=_seen_by(user).values('bank_question_id'))
+
+    ids = list(candidates.values_list('id', flat=True))
+    if not ids:
+        return []
+    picked_ids = random.sample(ids, min(count, len(ids)))
+    picked = BankQuestion.objects.in_bulk(picked_ids)
+    return [picked[pk] for pk in picked_ids]
+
+
+def _seen_by(user):
+    return Question.objects.filter(quiz__user=user, bank_question__isnull=False)
+
+
+def unseen_ids(bank_question_ids, user) -> set:
+    """The ids among ``bank_question_ids`` that ``user`` has not been served yet"""
+    ids = {pk for pk in bank_question_ids if pk}
+    if user is None or not ids:
+        return ids
+    seen = _seen_by(user).filter(bank_question_id__in=ids).values_list('bank_question_id', flat=True)
+    return ids - set(seen)
+
+
+def mark_served(bank_question_ids):
+    """Record that bank questions were used in a new quiz"""
+    ids = [pk for pk in bank_question_ids if pk]
+    if ids:
+        BankQuestion.objects.filter(id__in=ids).update(times_served=F('times_served') + 1)
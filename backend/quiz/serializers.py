@@ -72,7 +72,7 @@ class QuizSerializer(serializers.ModelSerializer):
     """Serializer for Quiz model"""
     questions = QuestionSerializer(many=True, read_only=True)
     username = serializers.CharField(source='user.username', read_only=True)
-    total_questions = serializers.IntegerField(read_only=True)
+    total_questions = serializers.IntegerField(source='question_count', read_only=True)
     
     class Meta:
         model = Quiz
@@ -114,6 +114,19 @@ class QuizAttemptSerializer(serializers.ModelSerializer):
                              'completed_at']
 
 
+class AttemptSummarySerializer(serializers.ModelSerializer):
+    """QuizAttempt without its answers, for activity feeds"""
+    username = serializers.CharField(source='user.username', read_only=True)
+    quiz_topic = serializers.CharField(source='quiz.topic', read_only=True)
+    quiz_difficulty = serializers.CharField(source='quiz.difficulty', read_only=True)
+
+    class Meta:
+        model = QuizAttempt
+        fields = ['id', 'username', 'quiz', 'quiz_topic', 'quiz_difficulty',
+                  'score', 'total_questions', 'score_percentage', 'completed_at']
+        read_only_fields = fields
+
+
 class QuizSubmitSerializer(serializers.Serializer):
     """Serializer for submitting quiz answers"""
     quiz_id = serializers.IntegerField()
@@ -121,6 +134,7 @@ class QuizSubmitSerializer(serializers.Serializer):
         child=serializers.DictField(child=serializers.IntegerField())
     )
     # answers format: [{"question_id": 1, "selected_option": 2}, ...]
+    submission_id = serializers.UUIDField(required=False, help_text="Makes retried submissions idempotent")
 
 
 class RegisterSerializer(serializers.Serializer):
@@ -160,3 +174,167 @@ class LoginSerializer(serializers.Serializer):
     """Serializer for user login"""
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
+
+
+# Fast read path
+#
+# The list and detail endpoints serialize many rows per request. The classes
+# below read plain dicts from QuerySet.values() and reshape them with a field
+# plan computed once per serializer, instead of building model instances and
+# running ModelSerializer's per-field machinery for every row and every
+# nested answer. Questions carry their options once, as a compact array.
+
+_datetime = serializers.DateTimeField()
+
+
+def _options(a, b, c, d):
+    return [a, b, c, d]
+
+
+class Column:
+    """An output field read from one or more values() lookups"""
+
+    def __init__(self, *lookups, convert=None):
+        self.lookups = lookups
+        self.convert = convert
+
+
+class RowSerializer:
+    """
+    Read-only serializer over values() rows.
+
+    ``columns`` maps output names to Columns; ``nested`` maps output names to
+    (child RowSerializer class, child foreign key, child ordering), loaded
+    with one query per nested field for a whole page of parents.
+    ``fields`` projects the output onto a subset of the top-level names.
+    """
+    model = None
+    columns = {}
+    nested = {}
+    # Always selected: the key for nesting plus whatever cursor pagination orders by
+    key_lookups = ('id',)
+
+    def __init__(self, fields=None):
+        names = [name for name in (*self.columns, *self.nested) if fields is None or name in fields]
+        self.plan = []
+        for name in names:
+            if name in self.columns:
+                column = self.columns[name]
+                self.plan.append((name, column.lookups, column.convert))
+        self.children = [
+            (name, child_class(), foreign_key, ordering)
+            for name, (child_class, foreign_key, ordering) in self.nested.items()
+            if name in names
+        ]
+        self.lookups = list(dict.fromkeys(
+            [*self.key_lookups, *(lookup for _, lookups, _ in self.plan for lookup in lookups)]
+        ))
+
+    @classmethod
+    def field_names(cls):
+        return [*cls.columns, *cls.nested]
+
+    def values(self, queryset):
+        return queryset.values(*self.lookups)
+
+    def serialize(self, rows) -> list:
+        rows = list(rows)
+        out = []
+        for row in rows:
+            item = {}
+            for name, lookups, convert in self.plan:
+                if convert is None:
+                    item[name] = row[lookups[0]]
+                elif len(lookups) == 1:
+                    value = row[lookups[0]]
+                    item[name] = None if value is None else convert(value)
+                else:
+                    item[name] = convert(*(row[lookup] for lookup in lookups))
+            out.append(item)
+
+        for name, child, foreign_key, ordering in self.children:
+            grouped = {row['id']: [] for row in rows}
+            child_rows = child.model.objects.filter(**{f'{foreign_key}__in': list(grouped)}).order_by(*ordering)
+            child_rows = list(child_rows.values(foreign_key, *child.lookups))
+            for parent_id, item in zip((child_row[foreign_key] for child_row in child_rows),
+                                       child.serialize(child_rows)):
+                grouped[parent_id].append(item)
+            for row, item in zip(rows, out):
+                item[name] = grouped[row['id']]
+        return out
+
+
+class QuestionRows(RowSerializer):
+    model = Question
+    columns = {
+        'id': Column('id'),
+        'question_text': Column('question_text'),
+        'options': Column('option_a', 'option_b', 'option_c', 'option_d', convert=_options),
+        'correct_option': Column('correct_option'),
+        'explanation': Column('explanation'),
+        'order': Column('order'),
+    }
+
+
+class QuizRows(RowSerializer):
+    model = Quiz
+    columns = {
+        'id': Column('id'),
+        'user': Column('user_id'),
+        'username': Column('user__username'),
+        'topic': Column('topic'),
+        'difficulty': Column('difficulty'),
+        'language': Column('language'),
+        'created_at': Column('created_at', convert=_datetime.to_representation),
+        'total_questions': Column('question_count'),
+    }
+    nested = {
+        'questions': (QuestionRows, 'quiz_id', ('order', 'id')),
+    }
+    key_lookups = ('id', 'created_at')
+
+
+def _question_details(pk, text, a, b, c, d, correct_option, explanation, order):
+    return {
+        'id': pk,
+        'question_text': text,
+        'options': [a, b, c, d],
+        'correct_option': correct_option,
+        'explanation': explanation,
+        'order': order,
+    }
+
+
+class AnswerRows(RowSerializer):
+    model = UserAnswer
+    columns = {
+        'id': Column('id'),
+        'question': Column('question_id'),
+        'question_details': Column(
+            'question__id', 'question__question_text', 'question__option_a', 'question__option_b',
+            'question__option_c', 'question__option_d', 'question__correct_option',
+            'question__explanation', 'question__order', convert=_question_details
+        ),
+        'selected_option': Column('selected_option'),
+        'is_correct': Column('is_correct'),
+    }
+
+
+class AttemptRows(RowSerializer):
+    model = QuizAttempt
+    columns = {
+        'id': Column('id'),
+        'user': Column('user_id'),
+        'username': Column('user__username'),
+        'quiz': Column('quiz_id'),
+        'quiz_topic': Column('quiz__topic'),
+        'quiz_difficulty': Column('quiz__difficulty'),
+        'score': Column('score'),
+        'total_questions': Column('total_questions'),
+        'score_percentage': Column('score_percentage'),
+        'completed_at': Column('completed_at', convert=_datetime.to_representation),
+    }
+    nested = {
+        'answers': (AnswerRows, 'attempt_id', ('question__order', 'id')),
+    }
+    key_lookups = ('id', 'completed_at')
@@ -0,0 +1,151 @@
+"""
+Quiz domain services shared by the web views, background jobs and API
+"""
+import random
+
+from django.db import transaction
+from django.db.models import F
+
+from . import gemini_service
+from . import generation_cache
+from . import question_bank
+from .models import Quiz, Question
+
+
+def iter_quiz_question_batches(topic: str, difficulty: str, count: int, language: str = 'en',
+                               fresh: bool = False, user=None):
+    """
+    Yield lists of validated question dictionaries for a quiz request as soon
+    as they are available.
+
+    Lookup order:
+        1. the generation cache: LLM output pooled per (topic, difficulty,
+           language). A pool with at least ``count`` questions answers the
+           whole request, preferring questions ``user`` has not seen, and
+           neither the bank nor the LLM is queried. Skipped when ``fresh``.
+        2. the shared question bank, excluding questions ``user`` has already seen
+        3. the LLM, asked only for the remaining questions; its output is
+           streamed so the first questions arrive early and added to the pool
+
+    Only LLM output is cached, never a user's sampled set. Questions that came
+    from (or were added to) the bank carry a ``bank_question_id`` key. For
+    freshly generated questions the key is filled in on the already-yielded
+    dicts once generation has finished.
+    """
+    cache = generation_cache.get_cache()
+    key = generation_cache.make_key(topic, difficulty, language)
+    if not fresh:
+        cached = _pick_cached(cache.get(key), user, count)
+        cache.record(cached is not None)
+        if cached:
+            yield cached
+            return
+
+    questions = [
+        question_bank.to_question_dict(bank_question)
+        for bank_question in question_bank.sample(topic, difficulty, count, language, user=user)
+    ]
+    if questions:
+        yield questions
+
+    shortfall = count - len(questions)
+    if shortfall <= 0:
+        return
+
+    generated = []
+    for batch in gemini_service.iter_question_batches(topic, difficulty, shortfall, language):
+        generated.extend(batch)
+        yield batch
+
+    bank_rows = question_bank.add_questions(generated, topic, difficulty, language)
+    bank_ids = {row.content_hash: row.id for row in bank_rows}
+    for q in generated:
+        q['bank_question_id'] = bank_ids.get(question_bank.question_hash(q))
+    cache.extend(key, generated)
+
+
+def _pick_cached(cached, user, count: int):
+    """``count`` random questions of a cached pool, those new to ``user`` first, or None"""
+    if not cached or len(cached) < count:
+        return None
+    unseen = question_bank.unseen_ids([q.get('bank_question_id') for q in cached], user)
+    shuffled = random.sample(cached, len(cached))
+    shuffled.sort(key=lambda q: q.get('bank_question_id') not in unseen)
+    return shuffled[:count]
+
+
+def get_quiz_questions(topic: str, difficulty: str, count: int, language: str = 'en',
+                       fresh: bool = False, user=None) -> list:
+    """Return all validated question dictionaries for a quiz request at once"""
+    questions = []
+    for batch in iter_quiz_question_batches(topic, difficulty, count, language, fresh=fresh, user=user):
+        questions.extend(batch)
+    return questions
+
+
+def build_question(quiz, q_data: dict, order: int) -> Question:
+    """Unsaved Question for a validated question dictionary"""
+    return Question(
+        quiz=quiz,
+        question_text=q_data['question'],
+        option_a=q_data['options'][0],
+        option_b=q_data['options'][1],
+        option_c=q_data['options'][2],
+        option_d=q_data['options'][3],
+        correct_option=q_data['correct_index'],
+        explanation=q_data['explanation'],
+        order=order,
+        bank_question_id=q_data.get('bank_question_id')
+    )
+
+
+def _insert_questions(quiz, questions_data: list, first_order: int) -> list:
+    questions = [
+        build_question(quiz, q_data, first_order + idx)
+        for idx, q_data in enumerate(questions_data)
+    ]
+    # Postgres and SQLite return primary keys from the batched insert
+    return Question.objects.bulk_create(questions)
+
+
+def add_questions(quiz, questions_data: list, first_order: int = 1) -> list:
+    """
+    Persist a batch of question dictionaries with a single INSERT and bump
+    the quiz's question_count in the same transaction
+    """
+    with transaction.atomic():
+        questions = _insert_questions(quiz, questions_data, first_order)
+        Quiz.objects.filter(pk=quiz.pk).update(question_count=F('question_count') + len(questions))
+    quiz.question_count += len(questions)
+    return questions
+
+
+def create_quiz(user, topic: str, difficulty: str, language: str, questions_data: list) -> tuple:
+    """
+    Create a quiz and all of its questions in one transaction.
+    Returns ``(quiz, questions)``, the questions in order with their primary keys.
+    """
+    with transaction.atomic():
+        quiz = Quiz.objects.create(
+            user=user,
+            topic=topic,
+            difficulty=difficulty,
+            language=language,
+            question_count=len(questions_data)
+        )
+        questions = _insert_questions(quiz, questions_data, first_order=1)
+    return quiz, questions
+
+
+def question_payload(quiz) -> list:
+    """
+    Compact, render-ready questions for the take page, in order, loaded with
+    one query. Answers and explanations are left out on purpose.
+    """
+    rows = quiz.questions.order_by('order').values_list(
+        'id', 'order', 'question_text', 'option_a', 'option_b', 'option_c', 'option_d'
+    )
+    return [
+        {'id': pk, 'order': order, 'question_text': text, 'options': (a, b, c, d)}
+        for pk, order, text, a, b, c, d in rows
+    ]
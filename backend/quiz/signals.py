@@ -1,7 +1,11 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import UserProfile
+from django.db.models import F
+from .models import Quiz, Question, QuizAttempt, UserProfile, SiteStats, SiteTheme
+from . import homepage_cache
+from . import theme_cache
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -14,3 +18,48 @@ def save_user_profile(sender, instance, **kwargs):
         instance.profile.save()
     except UserProfile.DoesNotExist:
         UserProfile.objects.create(user=instance)
+
+def _count_after_commit(field):
+    # Outside the creating transaction, so concurrent submissions do not queue on the stats row
+    transaction.on_commit(lambda: SiteStats.increment(field))
+
+@receiver(post_save, sender=User)
+def count_new_user(sender, instance, created, **kwargs):
+    if created:
+        _count_after_commit('total_users')
+
+@receiver(post_save, sender=Quiz)
+def count_new_quiz(sender, instance, created, **kwargs):
+    if created:
+        _count_after_commit('total_quizzes')
+
+@receiver(post_save, sender=QuizAttempt)
+def count_new_attempt(sender, instance, created, **kwargs):
+    if created:
+        _count_after_commit('total_attempts')
+
+@receiver(post_save, sender=SiteTheme)
+@receiver(post_delete, sender=SiteTheme)
+def invalidate_theme_cache(sender, **kwargs):
+    # Publish only after commit so no worker caches the pre-change row
+    transaction.on_commit(theme_cache.invalidate)
+
+@receiver(post_save, sender=Question)
+def count_added_question(sender, instance, created, **kwargs):
+    # Bulk inserts go through services.add_questions, which counts them itself
+    if created and not kwargs.get('raw'):
+        Quiz.objects.filter(pk=instance.quiz_id).update(question_count=F('question_count') + 1)
+
+@receiver(post_delete, sender=Question)
+def count_removed_question(sender, instance, origin=None, **kwargs):
+    # Questions only cascade-delete with their quiz; nothing to maintain then
+    if not (isinstance(origin, Question) or getattr(origin, 'model', None) is Question):
+        return
+    Quiz.objects.filter(pk=instance.quiz_id, question_count__gt=0).update(question_count=F('question_count') - 1)
+
+def invalidate_homepage_cache(sender, **kwargs):
+    transaction.on_commit(homepage_cache.invalidate)
+
+for model in homepage_cache.SOURCE_MODELS:
+    post_save.connect(invalidate_homepage_cache, sender=model, dispatch_uid=f'homepage_save_{model.__name__}')
+    post_delete.connect(invalidate_homepage_cache, sender=model, dispatch_uid=f'homepage_delete_{model.__name__}')
@@ -0,0 +1,100 @@
+"""
+Query-count regression tests for the REST API (quiz.api_views)
+
+The expected numbers are shared with the check_api_queries management
+command, which runs the same requests against a larger data set.
+"""
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from quiz import grading, jobs, leaderboard, services
+from quiz.management.commands.check_api_queries import EXPECTED_QUERIES, FAKE_BACKEND
+from quiz.models import QuizGenerationJob, SiteStats, UserProfile
+
+ROWS = 3
+QUESTIONS = 4
+
+
+@override_settings(QUIZ_LLM_BACKEND=FAKE_BACKEND, QUIZ_GENERATION_CACHE={'MAX_ENTRIES': 0},
+                   QUIZ_JOB_MODE='db', QUIZ_LEADERBOARD_SYNC_INTERVAL=3600)
+class APIQueryCountTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('api_check', 'api_check@example.com', 'x')
+        cls.admin = User.objects.create_user('api_admin', 'api_admin@example.com', 'x')
+        UserProfile.objects.filter(user=cls.admin).update(is_admin=True)
+        questions = [
+            {'question': f'Question {i}', 'options': ['A', 'B', 'C', 'D'], 'correct_index': i % 4,
+             'explanation': f'Because {i}'}
+            for i in range(QUESTIONS)
+        ]
+        cls.quizzes, cls.attempts = [], []
+        for i in range(ROWS):
+            quiz, created = services.create_quiz(cls.user, f'Topic {i}', 'Easy', 'en', questions)
+            cls.quizzes.append(quiz)
+            cls.attempts.append(grading.submit_attempt(cls.user, quiz, {q.id: 0 for q in created})[0])
+        cls.job = QuizGenerationJob.objects.create(user=cls.user, topic='Query check', difficulty='Easy', count=3)
+        jobs.run_job(cls.job.id)
+        cls.user_token = Token.objects.create(user=cls.user).key
+        cls.admin_token = Token.objects.create(user=cls.admin).key
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user_token}')
+        # Steady state: the stats row exists and the leaderboard is loaded
+        SiteStats.get()
+        leaderboard.top(leaderboard.GLOBAL)
+
+    def assertQueries(self, label, call, status_code=200):
+        # Run on_commit callbacks like a request outside a test transaction would
+        with self.assertNumQueries(EXPECTED_QUERIES[label]), self.captureOnCommitCallbacks(execute=True):
+            response = call()
+        self.assertEqual(response.status_code, status_code)
+        return response
+
+    def test_auth_me(self):
+        self.assertQueries('auth/me', lambda: self.client.get('/api/auth/me/'))
+
+    def test_generate_queues_a_job(self):
+        response = self.assertQueries('quiz/generate', lambda: self.client.post(
+            '/api/quiz/generate/', {'topic': 'Query check', 'difficulty': 'Easy', 'count': 5}, format='json'
+        ), status_code=202)
+        self.assertEqual(response.data['status'], QuizGenerationJob.STATUS_PENDING)
+        self.assertEqual(response['Location'], response.data['status_url'])
+
+    def test_job_status(self):
+        response = self.assertQueries('quiz/job', lambda: self.client.get(f'/api/quiz/jobs/{self.job.id}/'))
+        self.assertEqual(response.data['status'], QuizGenerationJob.STATUS_COMPLETED)
+        self.assertEqual(len(response.data['quiz']['questions']), 3)
+
+    def test_submit(self):
+        quiz = self.quizzes[0]
+        answers = [{'question_id': q.id, 'selected_option': 1} for q in quiz.questions.all()]
+        self.assertQueries('quiz/submit', lambda: self.client.post(
+            '/api/quiz/submit/', {'quiz_id': quiz.id, 'answers': answers}, format='json'
+        ), status_code=201)
+
+    def test_my_quizzes(self):
+        self.assertQueries('quizzes/my_quizzes', lambda: self.client.get('/api/quizzes/my_quizzes/'))
+
+    def test_quiz_detail(self):
+        url = f'/api/quizzes/{self.quizzes[0].id}/'
+        etag = self.assertQueries('quizzes/detail', lambda: self.client.get(url))['ETag']
+        self.assertQueries('quizzes/detail 304', lambda: self.client.get(url, HTTP_IF_NONE_MATCH=etag), 304)
+
+    def test_my_history(self):
+        self.assertQueries('attempts/my_history', lambda: self.client.get('/api/attempts/my_history/'))
+
+    def test_attempt_detail(self):
+        url = f'/api/attempts/{self.attempts[0].id}/'
+        etag = self.assertQueries('attempts/detail', lambda: self.client.get(url))['ETag']
+        self.assertQueries('attempts/detail 304', lambda: self.client.get(url, HTTP_IF_NONE_MATCH=etag), 304)
+
+    def test_stats(self):
+        self.assertQueries('attempts/stats', lambda: self.client.get('/api/attempts/stats/'))
+
+    def test_admin_dashboard(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.admin_token}')
+        self.assertQueries('admin/dashboard', lambda: self.client.get('/api/admin/dashboard/'))
@@ -0,0 +1,60 @@
+"""
+Cached lookup of the active SiteTheme
+
+The active theme is read on every page render but changes rarely. It is kept
+at three levels:
+
+    1. on the request, so repeated renders within one request are free
+    2. in process memory, tagged with the theme version it was loaded for
+    3. in the shared Django cache, under a key that includes the version
+
+The version token itself lives in the shared cache and is replaced whenever a
+SiteTheme is saved or deleted (see quiz.signals). Every request compares its
+process copy against the token, which each process re-reads from the shared
+cache at most every QUIZ_CACHE_VERSION_TTL seconds (quiz.cache_versions), so
+a steady-state lookup runs no query and an activation on one worker is picked
+up by all workers within that interval.
+Loading a theme also compiles its fingerprinted stylesheet (quiz.theme_css).
+"""
+import threading
+
+from . import cache_versions
+from . import theme_css
+from .models import SiteTheme
+
+NAMESPACE = 'site_theme'
+
+_process_lock = threading.Lock()
+_process_entry = (None, None)  # (version, theme)
+
+
+def get_active_theme(request=None) -> SiteTheme:
+    """Return the active theme, hitting the database only after a change"""
+    global _process_entry
+    if request is not None and hasattr(request, '_active_theme'):
+        return request._active_theme
+
+    cache = cache_versions.get_cache()
+    version = cache_versions.get_version(NAMESPACE, cache)
+    cached_version, theme = _process_entry
+    if cached_version != version:
+        key = cache_versions.versioned_key(NAMESPACE, 'active', version)
+        theme = cache.get(key)
+        if theme is None or not getattr(theme, 'stylesheet_url', None):
+            theme = SiteTheme.get_active_theme()
+            theme.stylesheet_url = theme_css.compile_theme(theme)
+            cache.set(key, theme, timeout=cache_versions.timeout(cache))
+        with _process_lock:
+            _process_entry = (version, theme)
+
+    if request is not None:
+        request._active_theme = theme
+    return theme
+
+
+def invalidate():
+    """Publish a new theme version; every process reloads on its next lookup"""
+    global _process_entry
+    cache_versions.bump(NAMESPACE)
+    with _process_lock:
+        _process_entry = (None, None)
@@ -0,0 +1,91 @@
+"""
+Compiled, fingerprinted theme stylesheets
+
+The active SiteTheme is rendered once into a CSS file whose name contains a
+hash of its contents (theme/theme.<hash>.css under STATIC_ROOT), so pages only
+emit a <link> tag and browsers can cache the stylesheet forever. A changed
+theme produces a new file name.
+
+Files compiled before the server starts (``compile_theme_css`` in build.sh)
+are served by whitenoise; files compiled later, or on another instance, are
+served by ``views.theme_stylesheet_view`` with the same cache headers.
+
+The template is rendered without autoescaping, so only values that cannot
+leave their declaration reach it: numbers, the fixed font and animation
+strings of SiteTheme, and colours that pass COLOR_PATTERN (anything else is
+replaced by the field's default). The theme name is not emitted.
+"""
+import copy
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+logger = logging.getLogger(__name__)
+
+THEME_DIR = 'theme'
+FILENAME_PATTERN = re.compile(r'(?:^|/)theme\.(?P<digest>[0-9a-f]{16})\.css$')
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+COLOR_PATTERN = re.compile(r'#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})')
+COLOR_FIELDS = (
+    'background_color_1', 'background_color_2', 'background_color_3', 'primary_color', 'secondary_color',
+    'accent_color', 'text_primary', 'text_secondary', 'text_muted', 'navbar_background', 'navbar_text',
+)
+
+
+def with_safe_colors(theme):
+    """Copy of ``theme`` whose colours are all hex values"""
+    safe = copy.copy(theme)
+    for name in COLOR_FIELDS:
+        if not COLOR_PATTERN.fullmatch(getattr(theme, name) or ''):
+            logger.warning(f"Invalid colour {name}={getattr(theme, name)!r} in theme {theme.pk}, using the default")
+            setattr(safe, name, theme._meta.get_field(name).get_default())
+    return safe
+
+
+def render_css(theme) -> str:
+    """Render a theme to CSS"""
+    theme = with_safe_colors(theme)
+    # get_background_css returns plain declarations; theme rules must win over page styles
+    background_css = theme.get_background_css().replace(';', ' !important;')
+    return render_to_string('quiz/theme.css', {'theme': theme, 'background_css': background_css})
+
+
+def css_digest(css: str) -> str:
+    return hashlib.sha256(css.encode('utf-8')).hexdigest()[:16]
+
+
+def stylesheet_path(digest: str) -> Path:
+    return Path(settings.STATIC_ROOT) / THEME_DIR / f'theme.{digest}.css'
+
+
+def stylesheet_url(digest: str) -> str:
+    return f'{settings.STATIC_URL}{THEME_DIR}/theme.{digest}.css'
+
+
+def write_stylesheet(digest: str, css: str):
+    """Write a compiled stylesheet atomically; failures are logged, not raised"""
+    path = stylesheet_path(digest)
+    if path.exists():
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(css)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write theme stylesheet {path}: {str(e)}")
+
+
+def compile_theme(theme) -> str:
+    """Compile a theme to its fingerprinted file; returns the stylesheet URL"""
+    css = render_css(theme)
+    digest = css_digest(css)
+    write_stylesheet(digest, css)
+    return stylesheet_url(digest)
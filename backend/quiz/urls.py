@@ -1,4 +1,5 @@
-from django.urls import path
+from django.conf import settings
+from django.urls import path, re_path
 from . import views
 
 urlpatterns = [
@@ -11,12 +12,19 @@ urlpatterns = [
     # App Views
     path('dashboard/', views.dashboard_view, name='dashboard'),
     path('generate/', views.generate_quiz_view, name='generate_quiz'),
+    path('generate/<int:job_id>/', views.quiz_job_status_view, name='quiz_job_status'),
+    path('generate/<int:job_id>/poll/', views.quiz_job_poll_view, name='quiz_job_poll'),
+    path('generate/<int:job_id>/events/', views.quiz_job_events_view, name='quiz_job_events'),
     path('take/<int:quiz_id>/', views.take_quiz_view, name='take_quiz'),
     path('submit/<int:quiz_id>/', views.submit_quiz_view, name='quiz_submit'),
     path('result/<int:attempt_id>/', views.result_view, name='quiz_result'),
     path('certificate/<int:attempt_id>/', views.certificate_view, name='certificate'),
+    path('certificate/<int:attempt_id>/<slug:version>.<str:fmt>', views.certificate_file_view,
+         name='certificate_file'),
     path('profile/', views.profile_view, name='profile'),
+    path('profile/history/', views.profile_history_view, name='profile_history'),
     path('profile/edit/', views.edit_profile_view, name='edit_profile'),
+    path('leaderboard/', views.leaderboard_view, name='leaderboard'),
     path('admin-dashboard/', views.admin_dashboard_view, name='admin_dashboard'),
     
     # Theme Management
@@ -26,4 +34,8 @@ urlpatterns = [
     path('themes/<int:theme_id>/delete/', views.theme_delete, name='theme_delete'),
     path('themes/<int:theme_id>/activate/', views.theme_activate, name='theme_activate'),
     path('themes/<int:theme_id>/preview/', views.theme_preview, name='theme_preview'),
+
+    # Compiled theme stylesheets not (yet) known to whitenoise
+    re_path(rf'^{settings.STATIC_URL.lstrip("/")}theme/theme\.(?P<digest>[0-9a-f]{{16}})\.css$',
+            views.theme_stylesheet_view, name='theme_stylesheet'),
 ]
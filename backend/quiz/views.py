@@ -3,20 +3,39 @@ from django.contrib.auth import login as auth_login, logout as auth_logout, auth
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth.forms import AuthenticationForm
-from django.db.models import Avg, Max
-from django.http import HttpResponse
-
-from .models import Quiz, Question, QuizAttempt, UserAnswer, UserProfile, SiteTheme
-from .gemini_service import generate_quiz_questions
+from django.db.models import Avg, Max, OuterRef, Subquery
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+
+from .models import Quiz, Question, QuizAttempt, UserProfile, SiteStats, SiteTheme, QuizGenerationJob
+from . import certificates
+from . import conditional
+from . import grading
+from . import jobs
+from . import leaderboard
+from . import page_cache
+from . import services
+from . import theme_cache
+from . import theme_css
+from .generation_cache import get_cache as get_generation_cache
+from .pagination import keyset_page
+import json
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+HISTORY_PAGE_SIZE = 20
+LEADERBOARD_SIZE = 20
+
 def landing_page(request):
     """Show landing page or redirect to dashboard if authenticated"""
     if request.user.is_authenticated:
         return redirect('dashboard')
-    return render(request, 'quiz/landing.html')
+    return page_cache.cached_anonymous_page(
+        request, 'landing', lambda: render(request, 'quiz/landing.html')
+    )
 
 def register_view(request):
     """Handle user registration"""
@@ -86,40 +105,25 @@ def dashboard_view(request):
 
 @login_required
 def generate_quiz_view(request):
-    """Handle quiz generation"""
+    """Accept a quiz generation request and hand it to the job queue"""
     if request.method == 'POST':
         topic = request.POST.get('topic')
         difficulty = request.POST.get('difficulty')
-        count = int(request.POST.get('count', 5))
         language = request.POST.get('language', 'en')
+        fresh = request.POST.get('fresh') in ('on', 'true', '1')
 
         try:
-            # Generate questions using Gemini AI
-            questions_data = generate_quiz_questions(topic, difficulty, count, language)
-            
-            # Create quiz
-            quiz = Quiz.objects.create(
+            count = int(request.POST.get('count', 5))
+            job = QuizGenerationJob.objects.create(
                 user=request.user,
                 topic=topic,
                 difficulty=difficulty,
-                language=language
+                count=count,
+                language=language,
+                fresh=fresh
             )
-            
-            # Create questions
-            for idx, q_data in enumerate(questions_data):
-                Question.objects.create(
-                    quiz=quiz,
-                    question_text=q_data['question'],
-                    option_a=q_data['options'][0],
-                    option_b=q_data['options'][1],
-                    option_c=q_data['options'][2],
-                    option_d=q_data['options'][3],
-                    correct_option=q_data['correct_index'],
-                    explanation=q_data['explanation'],
-                    order=idx + 1
-                )
-            
-            return redirect('take_quiz', quiz_id=quiz.id)
+            jobs.enqueue(job)
+            return redirect('quiz_job_status', job_id=job.id)
 
         except Exception as e:
             logger.error(f"Error generating quiz: {str(e)}")
@@ -128,11 +132,125 @@ def generate_quiz_view(request):
 
     return redirect('dashboard')
 
+@login_required
+def quiz_job_status_view(request, job_id):
+    """Waiting page for a generation job; forwards to the quiz once it is ready"""
+    job = get_object_or_404(QuizGenerationJob, id=job_id, user=request.user)
+
+    if job.status == QuizGenerationJob.STATUS_FAILED:
+        if job.quiz_id:
+            messages.warning(request, f"Only part of the quiz could be generated: {job.error}")
+            return redirect('take_quiz', quiz_id=job.quiz_id)
+        messages.error(request, f"Failed to generate quiz: {job.error}")
+        return redirect('dashboard')
+    if _job_quiz_ready(job):
+        return redirect('take_quiz', quiz_id=job.quiz_id)
+
+    return render(request, 'quiz/generation_status.html', {'job': job})
+
+@login_required
+def quiz_job_poll_view(request, job_id):
+    """JSON status of a generation job for the waiting page to poll"""
+    job = get_object_or_404(QuizGenerationJob, id=job_id, user=request.user)
+
+    data = {'id': job.id, 'status': job.status}
+    if job.is_finished or _job_quiz_ready(job):
+        # The status view performs the final redirect (and failure message)
+        data['redirect_url'] = reverse('quiz_job_status', args=[job.id])
+    return JsonResponse(data)
+
+def _job_quiz_ready(job):
+    """A quiz can be opened once its first questions have been persisted"""
+    # Jobs attach the quiz in the same transaction that saves its first questions
+    return job.quiz_id is not None
+
+@login_required
+def quiz_job_events_view(request, job_id):
+    """
+    Server-sent events stream of questions persisted by a running job.
+    Each response lasts a few seconds so it never holds a worker thread for
+    long; EventSource then reconnects and resumes from the Last-Event-ID
+    header (or ``?after=<order>`` before the first question).
+    """
+    job = get_object_or_404(QuizGenerationJob, id=job_id, user=request.user)
+    after = request.headers.get('Last-Event-ID') or request.GET.get('after') or 0
+    try:
+        after = int(after)
+    except ValueError:
+        after = 0
+
+    response = StreamingHttpResponse(_job_event_stream(job.id, after), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+def _job_event_stream(job_id, after, poll_interval=0.5, max_duration=8, retry_ms=500):
+    deadline = time.monotonic() + max_duration
+    yield f"retry: {retry_ms}\n\n"
+    while True:
+        job = QuizGenerationJob.objects.only('status', 'quiz_id', 'count', 'error').get(pk=job_id)
+        if job.quiz_id:
+            new_questions = Question.objects.filter(quiz_id=job.quiz_id, order__gt=after).values(
+                'id', 'order', 'question_text', 'option_a', 'option_b', 'option_c', 'option_d'
+            )
+            for q in new_questions:
+                after = q['order']
+                payload = {
+                    'id': q['id'],
+                    'order': q['order'],
+                    'question_text': q['question_text'],
+                    'options': [q['option_a'], q['option_b'], q['option_c'], q['option_d']],
+                }
+                yield f"event: question\nid: {q['order']}\ndata: {json.dumps(payload)}\n\n"
+
+        if job.is_finished:
+            done = {'status': job.status, 'total': after, 'error': job.error}
+            yield f"event: done\ndata: {json.dumps(done)}\n\n"
+            return
+        if time.monotonic() > deadline:
+            # EventSource reconnects after retry_ms and resumes from Last-Event-ID
+            return
+        yield ": keep-alive\n\n"
+        time.sleep(poll_interval)
+
 @login_required
 def take_quiz_view(request, quiz_id):
     """Render the quiz taking page"""
-    quiz = get_object_or_404(Quiz, id=quiz_id, user=request.user)
-    return render(request, 'quiz/take_quiz.html', {'quiz': quiz})
+    # While a job is still generating, render placeholders for the questions to come;
+    # the job is annotated onto the quiz so the page costs two queries in total
+    active_jobs = QuizGenerationJob.objects.filter(
+        quiz=OuterRef('pk'),
+        status__in=[QuizGenerationJob.STATUS_PENDING, QuizGenerationJob.STATUS_RUNNING]
+    ).order_by('-created_at')
+    quiz = get_object_or_404(
+        Quiz.objects.annotate(
+            generation_job_id=Subquery(active_jobs.values('id')[:1]),
+            generation_job_count=Subquery(active_jobs.values('count')[:1]),
+        ),
+        id=quiz_id,
+        user=request.user
+    )
+    def render_page():
+        questions = services.question_payload(quiz)
+        generation_job = None
+        total_questions = len(questions)
+        if quiz.generation_job_id:
+            generation_job = {'id': quiz.generation_job_id, 'count': quiz.generation_job_count}
+            total_questions = max(quiz.generation_job_count, total_questions)
+
+        return render(request, 'quiz/take_quiz.html', {
+            'quiz': quiz,
+            'questions': questions,
+            'total_questions': total_questions,
+            'pending_orders': range(len(questions) + 1, total_questions + 1),
+            'generation_job': generation_job,
+        })
+
+    if quiz.generation_job_id:
+        # Questions are still being added
+        return render_page()
+    # Once generated the quiz never changes, so a revalidating browser gets a 304
+    return conditional.conditional_page(request, ('take_quiz', quiz.id), quiz.created_at, render_page)
 
 @login_required
 def submit_quiz_view(request, quiz_id):
@@ -140,54 +258,12 @@ def submit_quiz_view(request, quiz_id):
     quiz = get_object_or_404(Quiz, id=quiz_id, user=request.user)
     
     if request.method == 'POST':
-        correct_count = 0
-        total_questions = quiz.questions.count()
-        
-        # Create attempt
-        attempt = QuizAttempt.objects.create(
-            user=request.user,
-            quiz=quiz,
-            score=0,
-            total_questions=total_questions,
-            score_percentage=0
+        attempt, _ = grading.submit_attempt(
+            request.user,
+            quiz,
+            grading.parse_selections(request.POST),
+            submission_id=grading.parse_submission_id(request.POST.get('submission_id'))
         )
-        
-        # Check answers
-        for question in quiz.questions.all():
-            selected_option_index = request.POST.get(f'question_{question.id}')
-            
-            if selected_option_index is not None:
-                selected_option = int(selected_option_index)
-                is_correct = (selected_option == question.correct_option)
-                
-                if is_correct:
-                    correct_count += 1
-                
-                UserAnswer.objects.create(
-                    attempt=attempt,
-                    question=question,
-                    selected_option=selected_option,
-                    is_correct=is_correct
-                )
-            else:
-                # Handle unanswered questions (optional, currently treating as wrong)
-                UserAnswer.objects.create(
-                    attempt=attempt,
-                    question=question,
-                    selected_option=-1, # -1 for no selection
-                    is_correct=False
-                )
-
-        # Update scores
-        score_percentage = int((correct_count / total_questions) * 100) if total_questions > 0 else 0
-        attempt.score = correct_count
-        attempt.score_percentage = score_percentage
-        attempt.save()
-
-        # Update profile stats
-        profile, _ = UserProfile.objects.get_or_create(user=request.user)
-        profile.update_stats()
-
         return redirect('quiz_result', attempt_id=attempt.id)
 
     return redirect('dashboard')
@@ -196,36 +272,89 @@ def submit_quiz_view(request, quiz_id):
 def result_view(request, attempt_id):
     """Show quiz results"""
     attempt = get_object_or_404(QuizAttempt, id=attempt_id, user=request.user)
-    answers = attempt.answers.select_related('question').all()
-    
-    return render(request, 'quiz/result.html', {
-        'attempt': attempt,
-        'answers': answers,
-        'score': attempt.score,
-        'total_questions': attempt.total_questions
-    })
+
+    def render_page():
+        return render(request, 'quiz/result.html', {
+            'attempt': attempt,
+            'answers': attempt.answers.select_related('question').all(),
+            'score': attempt.score,
+            'total_questions': attempt.total_questions
+        })
+
+    return conditional.conditional_page(request, ('result', attempt.id), attempt.completed_at, render_page)
 
 @login_required
 def certificate_view(request, attempt_id):
-    """Render a printable certificate"""
-    attempt = get_object_or_404(QuizAttempt, id=attempt_id, user=request.user)
-    return render(request, 'quiz/certificate.html', {
-        'attempt': attempt,
-        'final_score': attempt.score_percentage
-    })
+    """Render a printable certificate with links to its PDF and PNG"""
+    attempt = get_object_or_404(QuizAttempt.objects.select_related('user', 'quiz'), id=attempt_id, user=request.user)
+    certificate = certificates.certificate_data(attempt, theme_cache.get_active_theme(request))
+    certificates.prefetch(certificate)
+    return conditional.conditional_page(
+        request, ('certificate', attempt.id), attempt.completed_at,
+        lambda: render(request, 'quiz/certificate.html', {
+            'attempt': attempt,
+            'final_score': attempt.score_percentage,
+            'downloads': {
+                fmt: reverse('certificate_file', args=[attempt.id, certificate.version, fmt])
+                for fmt in certificates.FORMATS
+            },
+        })
+    )
+
+@login_required
+def certificate_file_view(request, attempt_id, version, fmt):
+    """Serve a rendered certificate; a versioned URL never changes, so browsers keep it for a year"""
+    if fmt not in certificates.FORMATS:
+        raise Http404
+    attempt = get_object_or_404(QuizAttempt.objects.select_related('user', 'quiz'), id=attempt_id, user=request.user)
+    certificate = certificates.certificate_data(attempt, theme_cache.get_active_theme(request))
+    if version != certificate.version:
+        return redirect('certificate_file', attempt_id=attempt.id, version=certificate.version, fmt=fmt)
+
+    name = certificates.ensure(certificate)[fmt]
+    response = FileResponse(
+        default_storage.open(name, 'rb'),
+        content_type=certificates.FORMATS[fmt],
+        filename=certificate.filename(fmt),
+    )
+    response['Cache-Control'] = certificates.CACHE_CONTROL
+    return response
 
 @login_required
 def profile_view(request):
     """User profile and history"""
     profile, _ = UserProfile.objects.get_or_create(user=request.user)
-    history = QuizAttempt.objects.filter(user=request.user).select_related('quiz').order_by('-completed_at')
+    history, next_cursor = keyset_page(
+        QuizAttempt.objects.filter(user=request.user).select_related('quiz'),
+        page_size=HISTORY_PAGE_SIZE
+    )
     
     return render(request, 'quiz/profile.html', {
         'profile': profile,
         'history': history,
+        'history_total': profile.total_quizzes_taken,
+        'next_cursor_json': json.dumps(next_cursor),
+        'next_cursor': next_cursor,
         'user': request.user
     })
 
+@login_required
+def profile_history_view(request):
+    """Next page of history rows for infinite scroll; the following cursor is in X-Next-Cursor"""
+    try:
+        history, next_cursor = keyset_page(
+            QuizAttempt.objects.filter(user=request.user).select_related('quiz'),
+            cursor=request.GET.get('cursor'),
+            page_size=HISTORY_PAGE_SIZE
+        )
+    except ValueError:
+        return HttpResponseBadRequest("Invalid cursor")
+
+    response = render(request, 'quiz/history_rows.html', {'history': history})
+    if next_cursor:
+        response['X-Next-Cursor'] = next_cursor
+    return response
+
 @login_required
 def edit_profile_view(request):
     """Edit user profile"""
@@ -252,6 +381,30 @@ def edit_profile_view(request):
 
     return render(request, 'quiz/edit_profile.html', {'user': request.user})
 
+@login_required
+def leaderboard_view(request):
+    """Top players and the viewer's own standing on one leaderboard"""
+    kind = request.GET.get('board', 'global')
+    value = request.GET.get('value')
+    if kind == 'difficulty' and value in dict(Quiz.DIFFICULTY_CHOICES):
+        board = leaderboard.difficulty_board(value)
+    elif kind == 'language' and value in dict(Quiz.LANGUAGE_CHOICES):
+        board = leaderboard.language_board(value)
+    elif kind == 'weekly':
+        board, value = leaderboard.weekly_board(), None
+    else:
+        kind, value, board = 'global', None, leaderboard.GLOBAL
+
+    return render(request, 'quiz/leaderboard.html', {
+        'kind': kind,
+        'value': value,
+        'standings': leaderboard.top(board, LEADERBOARD_SIZE),
+        'my_standing': leaderboard.rank(board, request.user),
+        'board_size': leaderboard.size(board),
+        'difficulties': Quiz.DIFFICULTY_CHOICES,
+        'languages': Quiz.LANGUAGE_CHOICES,
+    })
+
 @login_required
 def admin_dashboard_view(request):
     """Admin dashboard stats"""
@@ -259,21 +412,18 @@ def admin_dashboard_view(request):
         messages.error(request, "Access denied.")
         return redirect('dashboard')
 
-    from django.contrib.auth.models import User
-    
-    total_users = User.objects.count()
-    total_quizzes = Quiz.objects.count()
-    total_attempts = QuizAttempt.objects.count()
-    
+    stats = SiteStats.get()
+
     recent_attempts = QuizAttempt.objects.select_related('user', 'quiz').order_by('-completed_at')[:10]
-    top_performers = UserProfile.objects.select_related('user').order_by('-best_score')[:10]
 
     return render(request, 'quiz/admin_dashboard.html', {
-        'total_users': total_users,
-        'total_quizzes': total_quizzes,
-        'total_attempts': total_attempts,
+        'total_users': stats.total_users,
+        'total_quizzes': stats.total_quizzes,
+        'total_attempts': stats.total_attempts,
+        'stats_refreshed_at': stats.refreshed_at,
         'recent_attempts': recent_attempts,
-        'top_performers': top_performers
+        'top_performers': leaderboard.top(leaderboard.GLOBAL, 10),
+        'generation_cache': get_generation_cache().stats()
     })
 
 
@@ -287,7 +437,7 @@ def theme_list(request):
         return redirect('dashboard')
     
     themes = SiteTheme.objects.all()
-    active_theme = SiteTheme.get_active_theme()
+    active_theme = theme_cache.get_active_theme(request)
     
     return render(request, 'quiz/theme_list.html', {
         'themes': themes,
@@ -383,6 +533,26 @@ def theme_activate(request, theme_id):
     return redirect('theme_list')
 
 
+def theme_stylesheet_view(request, digest):
+    """
+    Serve a compiled theme stylesheet that whitenoise does not know about,
+    e.g. one compiled after startup or on another instance
+    """
+    path = theme_css.stylesheet_path(digest)
+    try:
+        css = path.read_text(encoding='utf-8')
+    except OSError:
+        theme = theme_cache.get_active_theme(request)
+        css = theme_css.render_css(theme)
+        if theme_css.css_digest(css) != digest:
+            raise Http404("Unknown theme stylesheet")
+        theme_css.write_stylesheet(digest, css)
+
+    response = HttpResponse(css, content_type='text/css; charset=utf-8')
+    response['Cache-Control'] = theme_css.CACHE_CONTROL
+    return response
+
+
 @login_required
 def theme_preview(request, theme_id):
     """Preview a theme without activating it"""
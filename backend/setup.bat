@@ -22,6 +22,7 @@ echo.
 echo Step 4: Running migrations...
 python manage.py makemigrations
 python manage.py migrate
+python manage.py createcachetable
 echo ✓ Database migrations completed
 echo.
 
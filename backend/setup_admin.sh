@@ -12,6 +12,7 @@ cd backend
 
 echo "📋 Step 1: Running migrations..."
 python manage.py migrate
+python manage.py createcachetable
 
 echo ""
 echo "👤 Step 2: Creating superuser..."
@@ -5,5 +5,7 @@ set -o errexit
 # Use the PORT environment variable provided by Render, default to 8000
 PORT=${PORT:-8000}
 
-# Start gunicorn
-gunicorn mindspark_backend.wsgi:application --bind 0.0.0.0:$PORT --workers 4
+# Start gunicorn; threaded workers so open event streams (quiz generation progress)
+# do not tie up a whole worker process each
+gunicorn mindspark_backend.wsgi:application --bind 0.0.0.0:$PORT --workers 4 \
+    --worker-class gthread --threads ${GUNICORN_THREADS:-8}
@@ -8,6 +8,7 @@ cd backend
 pip install -r requirements.txt
 python manage.py collectstatic --no-input
 python manage.py migrate
+python manage.py createcachetable
 cd ..
 
 # Install Frontend Dependencies
@@ -1,3 +1,3 @@
 #!/bin/bash
 # Quick setup script - Run in Render Shell
-cd backend && python manage.py migrate && python manage.py collectstatic --noinput && python manage.py create_default_superuser && echo "✅ Setup complete! Login at: https://quizai-d4ta.onrender.com/admin/ with admin@quizai.com / QuizAI@Admin2026"
+cd backend && python manage.py migrate && python manage.py createcachetable && python manage.py collectstatic --noinput && python manage.py create_default_superuser && echo "✅ Setup complete! Login at: https://quizai-d4ta.onrender.com/admin/ with admin@quizai.com / QuizAI@Admin2026"
@@ -1,6 +1,7 @@
 import { QuizResult, Difficulty, Language } from '../types';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api';
+const GENERATION_POLL_INTERVAL_MS = 1000;
 
 class APIService {
     private token: string | null = null;
@@ -19,15 +20,18 @@ class APIService {
             ...(options.headers as Record<string, string>),
         };
 
+        // Absolute URLs come from the API itself (e.g. a job's status_url)
+        const url = /^https?:\/\//.test(endpoint) ? endpoint : `${API_BASE_URL}${endpoint}`;
+
         console.log('API Request:', {
-            url: `${API_BASE_URL}${endpoint}`,
+            url,
             method: options.method || 'GET',
             hasToken: !!this.token,
             isFormData
         });
 
         try {
-            const response = await fetch(`${API_BASE_URL}${endpoint}`, {
+            const response = await fetch(url, {
                 ...options,
                 headers,
             });
@@ -122,10 +126,17 @@ class APIService {
 
     // Quiz Operations
     async generateQuiz(data: { topic: string; difficulty: Difficulty; count: number; language: Language }) {
-        return this.request('/quiz/generate/', {
+        // The server queues a generation job; poll it until the quiz is ready
+        const job = await this.request('/quiz/generate/', {
             method: 'POST',
             body: JSON.stringify(data),
         });
+        for (;;) {
+            const current = await this.request(job.status_url);
+            if (current.status === 'completed') return current.quiz;
+            if (current.status === 'failed') throw new Error(current.error || 'Quiz generation failed');
+            await new Promise((resolve) => setTimeout(resolve, GENERATION_POLL_INTERVAL_MS));
+        }
     }
 
     async submitQuiz(quizId: number | string, answers: Array<{ question_id: number; selected_option: number }>) {
@@ -41,6 +41,7 @@ echo ""
 # Run database migrations
 echo "🗄️  Running database migrations..."
 python manage.py migrate --noinput
+python manage.py createcachetable
 echo "✅ Migrations completed"
 echo ""
 